@@ -0,0 +1,250 @@
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any
+from urllib import error, parse, request
+from .diagnostics import collect, current_spans, span
+from .connection import ConnectionPool
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+API_BASE_URL = "https://kbbi.raf555.dev/api/v1"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 AccessibleKBBI/1.0"
+
+# Special entry names understood by every backend.
+WOTD = "_wotd"
+RANDOM = "_random"
+
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.05
+# Latency samples needed before the hedge delay follows the primary's p95.
+HEDGE_MIN_SAMPLES = 20
+
+
+class EntryNotFoundError(ValueError):
+	def __init__(self, query: str = ""):
+		super().__init__("Entri tidak ditemukan.")
+		self.query = query
+
+
+class Backend:
+	"""A source of raw entry data in the API's JSON shape.
+
+	fetch() returns the entry, returns None when this source has no answer (so
+	another one may be tried), raises EntryNotFoundError when the word does not
+	exist and ConnectionError when the source failed.
+	"""
+
+	name = ""
+
+	def fetch(self, name: str) -> dict[str, Any] | None:
+		raise NotImplementedError
+
+	def close(self):
+		pass
+
+
+class HTTPBackend(Backend):
+	"""The kbbi.raf555.dev API, or a mirror serving the same URL scheme."""
+
+	def __init__(
+		self,
+		base_url: str = API_BASE_URL,
+		retry: RetryPolicy | None = None,
+		breaker: CircuitBreaker | None = None,
+		timeout: float = 15,
+	):
+		super().__init__()
+		self.base_url = base_url.rstrip("/")
+		self.name = parse.urlsplit(self.base_url).netloc
+		self.timeout = timeout
+		self.pool = ConnectionPool(timeout)
+		self.retry = retry or RetryPolicy()
+		self.breaker = breaker or CircuitBreaker()
+
+	def fetch(self, name: str) -> dict[str, Any] | None:
+		url = f"{self.base_url}/entry/{parse.quote(name)}"
+		try:
+			return self._fetch(url)
+		except EntryNotFoundError as e:
+			e.query = name
+			raise
+
+	def close(self):
+		self.pool.close()
+
+	def _fetch(self, url: str) -> dict[str, Any] | None:
+		if not self.breaker.allow():
+			raise CircuitOpenError()
+		attempt = 0
+		while True:
+			attempt += 1
+			failure: Exception | None = None
+			try:
+				status, body = self._get(url)
+			except Exception as e:
+				status, body, failure = 0, b"", e
+			# Only an unreachable or failing server counts towards opening the breaker;
+			# any other answer shows that it is up.
+			server_failure = failure is not None or status == 429 or status >= 500
+			if not server_failure:
+				self.breaker.record_success()
+				break
+			# Server errors and dropped connections are worth another try; a timeout
+			# has already used up the whole wait, so it is not retried.
+			transient = not isinstance(failure, TimeoutError)
+			if not transient or attempt >= self.retry.attempts:
+				self.breaker.record_failure()
+				break
+			delay = self.retry.delay(attempt)
+			logging.debug(
+				f"KBBI API attempt {attempt} failed ({failure or status}), retrying in {delay:.2f}s",
+			)
+			time.sleep(delay)
+		if failure is not None:
+			logging.error(f"KBBI API Error: {str(failure)}")
+			raise ConnectionError(f"Terjadi kesalahan: {str(failure)}")
+		if status == 200:
+			try:
+				return json.loads(body.decode("utf-8"))
+			except Exception as e:
+				logging.error(f"KBBI API Error: {str(e)}")
+				raise ConnectionError(f"Terjadi kesalahan: {str(e)}")
+		logging.warning(f"KBBI API HTTP Error: {status} for {url}")
+		if status == 404:
+			raise EntryNotFoundError()
+		raise ConnectionError(f"Gagal menghubungi server: {status}")
+
+	def _get(self, url: str) -> tuple[int, bytes]:
+		headers = {"User-Agent": USER_AGENT}
+		if request.getproxies():
+			# http.client does not honour system proxy settings; let urllib handle those.
+			return self.get_urllib(url, headers)
+		return self.pool.get(url, headers)
+
+	def get_urllib(self, url: str, headers: dict[str, str]) -> tuple[int, bytes]:
+		"""GET the URL with a new urllib connection, honouring the system proxy settings."""
+		req = request.Request(url, headers=headers)
+		try:
+			# urllib connects inside urlopen, so connecting counts towards the first byte here.
+			with span("first_byte"):
+				response = request.urlopen(req, timeout=self.timeout)
+			with response, span("download"):
+				return response.getcode(), response.read()
+		except error.HTTPError as e:
+			return e.code, b""
+
+
+class HedgedRouter(Backend):
+	"""Asks the backends in order, starting the next one whenever the previous has not
+	answered within the hedge delay, and returns the first answer.
+
+	Unless fixed, the delay follows the 95th percentile of the first backend's recent
+	latencies, so only its slowest requests are hedged. A not-found answer counts as
+	an answer; failures and misses fall through to the next backend at once.
+	"""
+
+	name = "router"
+
+	def __init__(self, backends: list[Backend], hedge_delay: float | None = None, samples: int = 100):
+		super().__init__()
+		self.backends = backends
+		self.hedge_delay = hedge_delay
+		self.hedged = 0
+		self.wins: dict[str, int] = {}
+		self._latencies: deque[float] = deque(maxlen=samples)
+		self._lock = threading.Lock()
+
+	def current_delay(self) -> float:
+		if self.hedge_delay is not None:
+			return self.hedge_delay
+		with self._lock:
+			latencies = sorted(self._latencies)
+		if len(latencies) < HEDGE_MIN_SAMPLES:
+			return DEFAULT_HEDGE_DELAY
+		return max(MIN_HEDGE_DELAY, latencies[int(0.95 * (len(latencies) - 1))])
+
+	def fetch(self, name: str) -> dict[str, Any] | None:
+		delay = self.current_delay()
+		spans = current_spans()
+		waiting = list(self.backends)
+		running: dict[Future[dict[str, Any] | None], Backend] = {}
+		errors: list[Exception] = []
+		while waiting or running:
+			if waiting:
+				backend = waiting.pop(0)
+				if running:
+					self.hedged += 1
+				running[self._start(backend, name, spans)] = backend
+			done, _pending = wait(running, timeout=delay if waiting else None, return_when=FIRST_COMPLETED)
+			if not done:
+				# Hedge: the running backends are taking too long, start the next one too.
+				continue
+			# Anything that failed or had no answer lets the next backend start at once.
+			for future in done:
+				backend = running.pop(future)
+				try:
+					data = future.result()
+				except EntryNotFoundError:
+					self._record_win(backend)
+					raise
+				except Exception as e:
+					errors.append(e)
+					continue
+				if data is not None:
+					self._record_win(backend)
+					return data
+		if errors:
+			raise errors[0]
+		raise EntryNotFoundError(name)
+
+	def close(self):
+		for backend in self.backends:
+			backend.close()
+
+	def stats(self) -> dict[str, Any]:
+		return {"hedge_delay": self.current_delay(), "hedged": self.hedged, "wins": dict(self.wins)}
+
+	def _start(
+		self,
+		backend: Backend,
+		name: str,
+		spans: dict[str, float] | None,
+	) -> Future[dict[str, Any] | None]:
+		"""Run one attempt on a thread of its own.
+
+		A bounded pool would let slow attempts that lost the race, still waiting for
+		their timeout, hold the workers that later hedges need.
+		"""
+		future: Future[dict[str, Any] | None] = Future()
+
+		def run():
+			future.set_running_or_notify_cancel()
+			try:
+				future.set_result(self._timed_fetch(backend, name, spans))
+			except BaseException as e:
+				future.set_exception(e)
+
+		threading.Thread(target=run, name=f"accessibleKBBI-hedge-{backend.name}", daemon=True).start()
+		return future
+
+	def _timed_fetch(
+		self,
+		backend: Backend,
+		name: str,
+		spans: dict[str, float] | None,
+	) -> dict[str, Any] | None:
+		start = time.perf_counter()
+		# Network spans measured on the hedge thread belong to the caller's lookup.
+		with collect(spans):
+			data = backend.fetch(name)
+		if backend is self.backends[0]:
+			with self._lock:
+				self._latencies.append(time.perf_counter() - start)
+		return data
+
+	def _record_win(self, backend: Backend):
+		with self._lock:
+			self.wins[backend.name] = self.wins.get(backend.name, 0) + 1
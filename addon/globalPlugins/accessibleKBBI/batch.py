@@ -0,0 +1,66 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from .cache import normalize_query
+from .models import KBBIResult
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE_LIMIT = 5.0
+
+# Runs of letters, allowing hyphenated reduplication such as "anak-anak".
+_WORD_RE = re.compile(r"[^\W\d_]+(?:-[^\W\d_]+)*")
+
+
+def tokenize(text: str, min_length: int = 2) -> list[str]:
+	"""Unique normalized words of the text, in order of first appearance."""
+	words = (normalize_query(w) for w in _WORD_RE.findall(text))
+	return list(dict.fromkeys(w for w in words if len(w) >= min_length))
+
+
+@dataclass
+class BatchItem:
+	word: str
+	result: KBBIResult | None = None
+	error: str = ""
+	elapsed: float = 0.0
+	cached: bool = False
+
+
+class RateLimiter:
+	"""Spaces calls to wait() at least 1 / rate seconds apart across threads."""
+
+	def __init__(self, rate: float):
+		super().__init__()
+		self.interval = 1.0 / rate if rate > 0 else 0.0
+		self._next = 0.0
+		self._lock = threading.Lock()
+
+	def wait(self):
+		with self._lock:
+			now = time.monotonic()
+			start = max(now, self._next)
+			self._next = start + self.interval
+		if start > now:
+			time.sleep(start - now)
+
+
+def summarize(items: list[BatchItem], elapsed: float) -> dict[str, Any]:
+	latencies = sorted(item.elapsed for item in items if not item.cached)
+	done = len(items)
+
+	def percentile(p: float) -> float:
+		if not latencies:
+			return 0.0
+		return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+	return {
+		"words": done,
+		"cached": sum(1 for item in items if item.cached),
+		"errors": sum(1 for item in items if item.error),
+		"elapsed": elapsed,
+		"words_per_sec": done / elapsed if elapsed > 0 else 0.0,
+		"latency_p50": percentile(0.5),
+		"latency_p95": percentile(0.95),
+	}
@@ -0,0 +1,171 @@
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Seconds to wait for further changes before writing the file.
+SAVE_DELAY = 2.0
+
+
+def normalize_query(query: str) -> str:
+	return unicodedata.normalize("NFKC", query).strip().lower()
+
+
+class LookupCache:
+	"""Persistent LRU cache of raw API responses, keyed by normalized query."""
+
+	def __init__(
+		self,
+		path: str | None,
+		ttl: float = DEFAULT_TTL,
+		max_entries: int = DEFAULT_MAX_ENTRIES,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+	):
+		super().__init__()
+		self.path = path
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		# key -> (stored_at, size, raw JSON text)
+		self._entries: OrderedDict[str, tuple[float, int, str]] = OrderedDict()
+		self._total_bytes = 0
+		self._dirty = False
+		self._timer: threading.Timer | None = None
+		self._lock = threading.Lock()
+		# Held while writing the file, so writers never share the temporary file.
+		self._write_lock = threading.Lock()
+		self.load()
+
+	def load(self):
+		if not self.path or not os.path.exists(self.path):
+			return
+		try:
+			with open(self.path, "r", encoding="utf-8") as f:
+				stored = json.load(f)
+		except Exception as e:
+			logging.warning(f"KBBI cache could not be read: {e}")
+			return
+		with self._lock:
+			# Entries are stored least recently used first.
+			for key, stored_at, raw in stored.get("entries", []):
+				self._store(key, stored_at, raw)
+			self._evict()
+
+	def save(self):
+		"""Mark the cache dirty and write it shortly after, coalescing changes."""
+		if not self.path:
+			return
+		with self._lock:
+			self._dirty = True
+			if self._timer is None:
+				self._timer = threading.Timer(SAVE_DELAY, self.flush)
+				self._timer.daemon = True
+				self._timer.start()
+
+	def flush(self):
+		if not self.path:
+			return
+		with self._write_lock:
+			with self._lock:
+				if self._timer is not None:
+					self._timer.cancel()
+					self._timer = None
+				if not self._dirty:
+					return
+				entries = [[key, stored_at, raw] for key, (stored_at, _size, raw) in self._entries.items()]
+				self._dirty = False
+			tmp_path = f"{self.path}.tmp"
+			try:
+				with open(tmp_path, "w", encoding="utf-8") as f:
+					json.dump({"entries": entries}, f, ensure_ascii=False, separators=(",", ":"))
+				os.replace(tmp_path, self.path)
+			except Exception as e:
+				logging.warning(f"KBBI cache could not be saved: {e}")
+
+	def get(self, query: str) -> dict[str, Any] | None:
+		"""The cached response, or None if there is none or it has expired."""
+		data, fresh = self.lookup(query)
+		return data if fresh else None
+
+	def lookup(self, query: str) -> tuple[dict[str, Any] | None, bool]:
+		"""The cached response, even if expired, and whether it is still fresh.
+
+		Expired entries are kept until evicted or replaced, so that they can still be
+		served when the server cannot be reached. Only fresh ones count as hits.
+		"""
+		key = normalize_query(query)
+		with self._lock:
+			item = self._entries.get(key)
+			if item is None:
+				self.misses += 1
+				return None, False
+			fresh = not self._is_expired(item[0])
+			if fresh:
+				self.hits += 1
+			else:
+				self.misses += 1
+			self._entries.move_to_end(key)
+			raw = item[2]
+		return json.loads(raw), fresh
+
+	def put(self, query: str, data: dict[str, Any]):
+		key = normalize_query(query)
+		raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+		with self._lock:
+			self._store(key, time.time(), raw)
+			self._evict()
+		self.save()
+
+	def __contains__(self, query: str) -> bool:
+		key = normalize_query(query)
+		with self._lock:
+			item = self._entries.get(key)
+			return item is not None and not self._is_expired(item[0])
+
+	def keys(self) -> list[str]:
+		with self._lock:
+			return list(self._entries)
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def clear(self):
+		with self._lock:
+			self._entries.clear()
+			self._total_bytes = 0
+		self.save()
+
+	def stats(self) -> dict[str, Any]:
+		lookups = self.hits + self.misses
+		return {
+			"entries": len(self._entries),
+			"bytes": self._total_bytes,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_ratio": self.hits / lookups if lookups else 0.0,
+		}
+
+	def _is_expired(self, stored_at: float) -> bool:
+		return bool(self.ttl) and time.time() - stored_at > self.ttl
+
+	def _store(self, key: str, stored_at: float, raw: str):
+		old = self._entries.pop(key, None)
+		if old is not None:
+			self._total_bytes -= old[1]
+		size = len(raw.encode("utf-8"))
+		self._entries[key] = (stored_at, size, raw)
+		self._total_bytes += size
+
+	def _evict(self):
+		while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+			_key, (_stored_at, size, _raw) = self._entries.popitem(last=False)
+			self._total_bytes -= size
@@ -0,0 +1,119 @@
+import argparse
+import json
+import sys
+import time
+from collections.abc import Iterator
+from typing import Any, TextIO
+from .formatter import FORMAT_DEFINITIONS, FORMAT_HTML, FORMAT_MARKDOWN, FORMAT_TEXT, render, summary
+from .batch import DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT, BatchItem, summarize
+from .lookup import OfflineUnavailableError, iter_lookup, open_client
+
+FORMAT_JSON = "json"
+FORMAT_SUMMARY = "summary"
+OUTPUT_FORMATS = (
+	FORMAT_TEXT,
+	FORMAT_DEFINITIONS,
+	FORMAT_MARKDOWN,
+	FORMAT_HTML,
+	FORMAT_SUMMARY,
+	FORMAT_JSON,
+)
+
+
+def _read_words(stream: TextIO) -> Iterator[str]:
+	# One query per line, so phrases such as "rumah sakit" can be looked up too.
+	for line in stream:
+		word = line.strip()
+		if word:
+			yield word
+
+
+def _item_json(item: BatchItem) -> dict[str, Any]:
+	data: dict[str, Any] = {"query": item.word, "cached": item.cached, "elapsed": round(item.elapsed, 4)}
+	if item.result is not None:
+		data["stale"] = item.result.stale
+		data["result"] = item.result.to_raw()
+	else:
+		data["error"] = item.error
+	return data
+
+
+def _print_item(item: BatchItem, fmt: str, out: TextIO, first: bool):
+	if fmt == FORMAT_JSON:
+		# JSON Lines, so results can be consumed while the rest are still being looked up.
+		out.write(json.dumps(_item_json(item), ensure_ascii=False) + "\n")
+	elif item.result is None:
+		print(f"{item.word}: {item.error}", file=sys.stderr)
+		return
+	elif fmt == FORMAT_SUMMARY:
+		out.write(summary(item.result) + "\n")
+	else:
+		if not first:
+			out.write("\n")
+		out.write(render(item.result, fmt) + "\n")
+	out.flush()
+
+
+def lookup_command(args: argparse.Namespace) -> int:
+	try:
+		client = open_client(args.data_dir, offline=True if args.offline else None, base_url=args.base_url)
+	except OfflineUnavailableError as e:
+		print(e, file=sys.stderr)
+		return 1
+	if args.no_cache:
+		client.cache = None
+	words = _read_words(sys.stdin) if not args.words or args.words == ["-"] else iter(args.words)
+	items: list[BatchItem] = []
+	start = time.perf_counter()
+	try:
+		for item in iter_lookup(client, words, max_workers=args.jobs, rate_limit=args.rate):
+			_print_item(item, args.format, sys.stdout, first=not items)
+			items.append(item)
+	except KeyboardInterrupt:
+		return 130
+	finally:
+		if client.cache is not None:
+			client.cache.flush()
+	if args.stats:
+		print(json.dumps(summarize(items, time.perf_counter() - start)), file=sys.stderr)
+	return 1 if any(item.error for item in items) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(
+		prog="python -m accessibleKBBI",
+		description="Pencarian KBBI tanpa NVDA.",
+	)
+	commands = parser.add_subparsers(dest="command", required=True)
+	lookup = commands.add_parser("lookup", help="Cari satu atau beberapa kata.")
+	lookup.add_argument(
+		"words",
+		nargs="*",
+		help='Kata yang dicari; kosong atau "-" membaca satu kata per baris dari stdin.',
+	)
+	lookup.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default=FORMAT_TEXT)
+	lookup.add_argument(
+		"-j",
+		"--jobs",
+		type=int,
+		default=DEFAULT_CONCURRENCY,
+		help="Jumlah pencarian paralel.",
+	)
+	lookup.add_argument(
+		"--rate",
+		type=float,
+		default=DEFAULT_RATE_LIMIT,
+		help="Batas permintaan ke server per detik (0 tanpa batas).",
+	)
+	lookup.add_argument("--data-dir", help="Folder konfigurasi dan cache (bawaan: ~/.accessibleKBBI).")
+	lookup.add_argument("--base-url", help="Alamat API lain dengan format yang sama.")
+	lookup.add_argument("--offline", action="store_true", help="Gunakan kamus offline yang sudah diimpor.")
+	lookup.add_argument("--no-cache", action="store_true", help="Jangan baca atau simpan cache.")
+	lookup.add_argument("--stats", action="store_true", help="Tulis ringkasan waktu pencarian ke stderr.")
+	lookup.set_defaults(func=lookup_command)
+	return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+	args = build_parser().parse_args(argv)
+	return args.func(args)
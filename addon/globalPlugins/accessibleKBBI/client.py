@@ -1,82 +1,185 @@
-import json
 import logging
-from urllib import request, error, parse
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
-from .models import KBBIResult, Entry, Definition, Label
+from .diagnostics import add_span, collect, current_spans, record_cache
+from .backends import API_BASE_URL, RANDOM, WOTD, Backend, EntryNotFoundError, HTTPBackend
+from .batch import DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT, BatchItem, RateLimiter
+from .cache import LookupCache, normalize_query
+from .models import KBBIResult, Entry
+from .resilience import CircuitBreaker, RetryPolicy
 
-API_BASE_URL = "https://kbbi.raf555.dev/api/v1"
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 AccessibleKBBI/1.0"
+# Seconds between attempts to refresh an expired entry that was served because the
+# server could not be reached, and how many attempts are made.
+REVALIDATE_INTERVAL = 15.0
+REVALIDATE_ATTEMPTS = 8
 
 
 class KBBIClient:
-	def __init__(self):
+	def __init__(
+		self,
+		base_url: str = API_BASE_URL,
+		cache: LookupCache | None = None,
+		retry: RetryPolicy | None = None,
+		breaker: CircuitBreaker | None = None,
+		backend: Backend | None = None,
+	):
 		super().__init__()
-		self.timeout = 15
+		self.cache = cache
+		self.backend = backend or HTTPBackend(base_url, retry=retry, breaker=breaker)
+		# Parse definitions and word lists only when they are first read. Lazy entries keep
+		# the raw response until every field has been read, so this only pays off for
+		# results that are mostly never read.
+		self.lazy = False
+		self._revalidating: set[str] = set()
+		self._lock = threading.Lock()
 
-	def _fetch(self, url: str) -> dict[str, Any] | None:
-		req = request.Request(url)
-		req.add_header("User-Agent", USER_AGENT)
-		try:
-			with request.urlopen(req, timeout=self.timeout) as response:
-				if response.getcode() == 200:
-					return json.loads(response.read().decode("utf-8"))
-		except error.HTTPError as e:
-			logging.warning(f"KBBI API HTTP Error: {e.code} for {url}")
-			if e.code == 404:
-				raise ValueError("Entri tidak ditemukan.")
-			raise ConnectionError(f"Gagal menghubungi server: {e.code}")
-		except Exception as e:
-			logging.error(f"KBBI API Error: {str(e)}")
-			raise ConnectionError(f"Terjadi kesalahan: {str(e)}")
-		return None
-
-	def _parse_response(self, data: dict[str, Any] | None) -> KBBIResult:
+	def parse_response(self, data: dict[str, Any] | None, lazy: bool | None = None) -> KBBIResult:
+		"""Build a result from raw entry data in the API's JSON shape."""
 		if not data or "entries" not in data:
 			raise ValueError("Format data tidak valid.")
 
+		start = time.perf_counter()
 		lemma = str(data.get("lemma", ""))
-		entries_list = []
-
-		for e_data in data.get("entries", []):
-			defs = []
-			for d_data in e_data.get("definitions", []):
-				labels = [Label(**lbl_data) for lbl_data in d_data.get("labels", [])]
-				defs.append(
-					Definition(
-						definition=d_data.get("definition", ""),
-						referencedLemma=d_data.get("referencedLemma", ""),
-						labels=labels,
-						usageExamples=d_data.get("usageExamples", []),
-					),
-				)
-
-			entries_list.append(
-				Entry(
-					entry=e_data.get("entry", ""),
-					baseWord=e_data.get("baseWord", ""),
-					pronunciation=e_data.get("pronunciation", ""),
-					definitions=defs,
-					derivedWords=[w for w in e_data.get("derivedWords", []) if w],
-					compoundWords=[w for w in e_data.get("compoundWords", []) if w],
-					metaphors=[w for w in e_data.get("metaphors", []) if w],
-					proverbs=[w for w in e_data.get("proverbs", []) if w],
-				),
-			)
-
-		return KBBIResult(lemma=lemma, entries=entries_list)
+		lazy = self.lazy if lazy is None else lazy
+		entries_list = [Entry.from_raw(e_data, lazy=lazy) for e_data in data.get("entries", [])]
+		result = KBBIResult(lemma=lemma, entries=entries_list)
+		spans = current_spans()
+		add_span("parse", time.perf_counter() - start, spans)
+		if spans is not None:
+			result.timings = spans
+		return result
+
+	def _fetch_entry(self, name: str) -> dict[str, Any] | None:
+		data = self.backend.fetch(name)
+		if data is None:
+			raise EntryNotFoundError(name)
+		return data
 
 	def search(self, query: str) -> KBBIResult:
-		safe_query = parse.quote(query)
-		url = f"{API_BASE_URL}/entry/{safe_query}"
-		data = self._fetch(url)
-		return self._parse_response(data)
+		with collect():
+			return self._search(query)
+
+	def _search(self, query: str) -> KBBIResult:
+		stale: dict[str, Any] | None = None
+		if self.cache is not None:
+			cached, fresh = self.cache.lookup(query)
+			record_cache(fresh)
+			if fresh:
+				return self.parse_response(cached)
+			stale = cached
+		try:
+			return self.fetch_remote(query)
+		except ConnectionError:
+			# While the server is unreachable or the breaker is open, an expired entry
+			# beats no answer; it is refreshed in the background once the server is back.
+			if stale is None:
+				raise
+			self._revalidate(query)
+			result = self.parse_response(stale)
+			result.stale = True
+			return result
+
+	def _revalidate(self, query: str):
+		key = normalize_query(query)
+		with self._lock:
+			if key in self._revalidating:
+				return
+			self._revalidating.add(key)
+		threading.Thread(
+			target=self._revalidate_worker,
+			args=(key,),
+			name="accessibleKBBI-revalidate",
+			daemon=True,
+		).start()
+
+	def _revalidate_worker(self, key: str):
+		try:
+			for _attempt in range(REVALIDATE_ATTEMPTS):
+				time.sleep(REVALIDATE_INTERVAL)
+				try:
+					# Background work, kept out of the user's lookup timings.
+					with collect(record=False):
+						self.fetch_remote(key, lazy=True)
+					return
+				except ConnectionError:
+					continue
+				except Exception as e:
+					logging.debug(f"KBBI refresh of {key!r} failed: {e}")
+					return
+		finally:
+			with self._lock:
+				self._revalidating.discard(key)
+
+	def fetch_remote(self, query: str, lazy: bool | None = None) -> KBBIResult:
+		"""Look the query up on the backend, skipping the cache, and cache the answer."""
+		data = self._fetch_entry(query)
+		result = self.parse_response(data, lazy)
+		if self.cache is not None and data is not None:
+			self.cache.put(query, data)
+		return result
+
+	def search_many(
+		self,
+		words: Iterable[str],
+		on_result: Callable[[BatchItem], None] | None = None,
+		max_workers: int = DEFAULT_CONCURRENCY,
+		rate_limit: float = DEFAULT_RATE_LIMIT,
+		is_cancelled: Callable[[], bool] = lambda: False,
+	) -> list[BatchItem]:
+		"""Look up many words, serving cached ones first and fetching the rest concurrently.
+
+		Results are passed to on_result as they arrive and returned in input order.
+		"""
+		words = list(dict.fromkeys(normalize_query(w) for w in words if w.strip()))
+		items: dict[str, BatchItem] = {}
+		to_fetch: list[str] = []
+		for word in words:
+			cached = self.cache.get(word) if self.cache is not None else None
+			if self.cache is not None:
+				record_cache(cached is not None)
+			if cached is None:
+				to_fetch.append(word)
+				continue
+			item = BatchItem(word, result=self.parse_response(cached), cached=True)
+			items[word] = item
+			if on_result:
+				on_result(item)
+
+		limiter = RateLimiter(rate_limit)
+
+		def fetch(word: str) -> BatchItem:
+			if is_cancelled():
+				return BatchItem(word, error="Dibatalkan.")
+			limiter.wait()
+			start = time.perf_counter()
+			try:
+				with collect():
+					result = self.fetch_remote(word)
+				return BatchItem(word, result=result, elapsed=time.perf_counter() - start)
+			except Exception as e:
+				return BatchItem(word, error=str(e), elapsed=time.perf_counter() - start)
+
+		if to_fetch:
+			with ThreadPoolExecutor(
+				max_workers=max_workers,
+				thread_name_prefix="accessibleKBBI-batch",
+			) as pool:
+				for future in as_completed([pool.submit(fetch, word) for word in to_fetch]):
+					item = future.result()
+					items[item.word] = item
+					if on_result and not is_cancelled():
+						on_result(item)
+		return [items[word] for word in words]
 
 	def get_wotd(self) -> KBBIResult:
-		url = f"{API_BASE_URL}/entry/_wotd"
-		data = self._fetch(url)
-		return self._parse_response(data)
+		with collect():
+			data = self._fetch_entry(WOTD)
+			return self.parse_response(data)
 
 	def get_random(self) -> KBBIResult:
-		url = f"{API_BASE_URL}/entry/_random"
-		data = self._fetch(url)
-		return self._parse_response(data)
+		with collect():
+			data = self._fetch_entry(RANDOM)
+			return self.parse_response(data)
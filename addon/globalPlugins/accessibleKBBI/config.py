@@ -1,15 +1,54 @@
 import os
 import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any
+from .backends import API_BASE_URL
+from .cache import DEFAULT_TTL, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES, LookupCache
+from .prefetch import DEFAULT_PREFETCH_COUNT
+from .resilience import (
+	DEFAULT_BREAKER_COOLDOWN,
+	DEFAULT_BREAKER_THRESHOLD,
+	DEFAULT_RETRY_ATTEMPTS,
+	DEFAULT_RETRY_BASE_DELAY,
+)
+
+SCHEMA_VERSION = 1
+CONFIG_FILE = "accessibleKBBI.json"
+CACHE_FILE = "accessibleKBBI-cache.json"
+OFFLINE_DB_FILE = "accessibleKBBI-offline.db"
+MAX_HISTORY = 50
+# Seconds to wait for further changes before writing the file.
+SAVE_DELAY = 2.0
+
+
+def get_data_dir() -> str:
+	"""Directory in the NVDA user configuration that survives add-on updates."""
+	import globalVars
+
+	return os.path.join(globalVars.appArgs.configPath, "accessibleKBBI")
 
 
 class ConfigManager:
-	def __init__(self):
+	def __init__(self, data_dir: str | None = None):
 		super().__init__()
-		self.config_path = os.path.join(
-			os.path.dirname(__file__),
-			"accessibleKBBI.json",
-		)
-		self.data = {"history": [], "favorites": []}
+		self.data_dir = data_dir or get_data_dir()
+		self.config_path = os.path.join(self.data_dir, CONFIG_FILE)
+		self.cache_path = os.path.join(self.data_dir, CACHE_FILE)
+		self.offline_db_path = os.path.join(self.data_dir, OFFLINE_DB_FILE)
+		self.data: dict[str, Any] = {}
+		# Most recent first; dicts keep order and give O(1) membership.
+		self._history: OrderedDict[str, None] = OrderedDict()
+		self._favorites: OrderedDict[str, None] = OrderedDict()
+		self._dirty = False
+		self._timer: threading.Timer | None = None
+		self._lock = threading.RLock()
+		# Held while writing the file, so the save timer and an explicit flush never
+		# share the temporary file.
+		self._write_lock = threading.Lock()
+		self._cache: LookupCache | None = None
+		os.makedirs(self.data_dir, exist_ok=True)
 		self.load()
 
 	def load(self):
@@ -17,53 +56,188 @@ class ConfigManager:
 			if os.path.exists(self.config_path):
 				with open(self.config_path, "r", encoding="utf-8") as f:
 					self.data = json.load(f)
-		except Exception:
-			# If fails, use default
-			pass
+		except Exception as e:
+			# Keep the unreadable file aside instead of overwriting it on the next save.
+			logging.warning(f"KBBI config could not be read, starting fresh: {e}")
+			try:
+				os.replace(self.config_path, f"{self.config_path}.bak")
+			except OSError:
+				pass
+			self.data = {}
+		self._upgrade_schema()
+		self._history = OrderedDict.fromkeys(self.data.pop("history", []))
+		self._favorites = OrderedDict.fromkeys(self.data.pop("favorites", []))
+
+	def _upgrade_schema(self):
+		version = self.data.get("schema_version", 0)
+		if version > SCHEMA_VERSION:
+			logging.warning(f"KBBI config schema {version} is newer than supported {SCHEMA_VERSION}")
+			return
+		if version < 1:
+			# Version 0 files had no version field and may lack the list keys.
+			self.data.setdefault("history", [])
+			self.data.setdefault("favorites", [])
+		if version != SCHEMA_VERSION:
+			self.data["schema_version"] = SCHEMA_VERSION
+			self.save()
 
 	def save(self):
-		try:
-			with open(self.config_path, "w", encoding="utf-8") as f:
-				json.dump(self.data, f, ensure_ascii=False, indent=2)
-		except Exception:
-			pass
+		"""Mark the configuration dirty and write it shortly after, coalescing changes."""
+		with self._lock:
+			self._dirty = True
+			if self._timer is None:
+				self._timer = threading.Timer(SAVE_DELAY, self._write)
+				self._timer.daemon = True
+				self._timer.start()
+
+	def flush(self):
+		"""Write pending changes to the configuration and the lookup cache now."""
+		self._write()
+		if self._cache is not None:
+			self._cache.flush()
+
+	def _write(self):
+		with self._write_lock:
+			with self._lock:
+				if self._timer is not None:
+					self._timer.cancel()
+					self._timer = None
+				if not self._dirty:
+					return
+				data = dict(self.data)
+				data["history"] = list(self._history)
+				data["favorites"] = list(self._favorites)
+				self._dirty = False
+			tmp_path = f"{self.config_path}.tmp"
+			try:
+				with open(tmp_path, "w", encoding="utf-8") as f:
+					json.dump(data, f, ensure_ascii=False, indent=2)
+				os.replace(tmp_path, self.config_path)
+			except Exception as e:
+				logging.warning(f"KBBI config could not be saved: {e}")
 
 	def add_history(self, lemma: str):
 		if not lemma:
 			return
-		# Remove if exists to move to top
-		if lemma in self.data["history"]:
-			self.data["history"].remove(lemma)
-
-		self.data["history"].insert(0, lemma)
-		# Limit history to 50
-		self.data["history"] = self.data["history"][:50]
+		with self._lock:
+			# Move to top
+			self._history[lemma] = None
+			self._history.move_to_end(lemma, last=False)
+			# Limit history to 50
+			while len(self._history) > MAX_HISTORY:
+				self._history.popitem()
 		self.save()
 
 	def remove_history(self, lemma: str):
-		if lemma in self.data["history"]:
-			self.data["history"].remove(lemma)
-			self.save()
+		with self._lock:
+			if lemma in self._history:
+				del self._history[lemma]
+				self.save()
 
 	def get_history(self) -> list[str]:
-		return self.data["history"]
+		return list(self._history)
 
 	def clear_history(self):
-		self.data["history"] = []
+		with self._lock:
+			self._history.clear()
 		self.save()
 
 	def add_favorite(self, lemma: str):
-		if lemma and lemma not in self.data["favorites"]:
-			self.data["favorites"].insert(0, lemma)
-			self.save()
+		with self._lock:
+			if lemma and lemma not in self._favorites:
+				self._favorites[lemma] = None
+				self._favorites.move_to_end(lemma, last=False)
+				self.save()
 
 	def remove_favorite(self, lemma: str):
-		if lemma in self.data["favorites"]:
-			self.data["favorites"].remove(lemma)
-			self.save()
+		with self._lock:
+			if lemma in self._favorites:
+				del self._favorites[lemma]
+				self.save()
 
 	def is_favorite(self, lemma: str) -> bool:
-		return lemma in self.data["favorites"]
+		return lemma in self._favorites
 
 	def get_favorites(self) -> list[str]:
-		return self.data["favorites"]
+		return list(self._favorites)
+
+	def is_offline_mode(self) -> bool:
+		return self.data.get("mode", "online") == "offline"
+
+	def set_offline_mode(self, enabled: bool):
+		self.data["mode"] = "offline" if enabled else "online"
+		self.save()
+
+	def is_prefetch_enabled(self) -> bool:
+		return self.data.get("prefetch", False)
+
+	def set_prefetch_enabled(self, enabled: bool):
+		self.data["prefetch"] = enabled
+		self.save()
+
+	def is_warm_dialog_enabled(self) -> bool:
+		return self.data.get("warm_dialog", True)
+
+	def set_warm_dialog_enabled(self, enabled: bool):
+		self.data["warm_dialog"] = enabled
+		self.save()
+
+	def is_keep_last_result_enabled(self) -> bool:
+		return self.data.get("keep_last_result", False)
+
+	def set_keep_last_result_enabled(self, enabled: bool):
+		self.data["keep_last_result"] = enabled
+		self.save()
+
+	def get_prefetch_count(self) -> int:
+		return self.data.get("prefetch_count", DEFAULT_PREFETCH_COUNT)
+
+	def get_cache(self) -> LookupCache:
+		"""The lookup cache, loaded from disk once and shared by every client."""
+		with self._lock:
+			if self._cache is None:
+				self._cache = LookupCache(self.cache_path, **self.get_cache_settings())
+			return self._cache
+
+	def get_cache_settings(self) -> dict[str, int]:
+		return {
+			"ttl": self.data.get("cache_ttl", DEFAULT_TTL),
+			"max_entries": self.data.get("cache_max_entries", DEFAULT_MAX_ENTRIES),
+			"max_bytes": self.data.get("cache_max_bytes", DEFAULT_MAX_BYTES),
+		}
+
+	def get_retry_settings(self) -> dict[str, Any]:
+		return {
+			"attempts": self.data.get("retry_attempts", DEFAULT_RETRY_ATTEMPTS),
+			"base_delay": self.data.get("retry_base_delay", DEFAULT_RETRY_BASE_DELAY),
+		}
+
+	def get_api_url(self) -> str:
+		return self.data.get("api_url", API_BASE_URL)
+
+	def get_mirror_url(self) -> str:
+		"""Base URL of a second server with the same API, raced against the main one."""
+		return self.data.get("mirror_url", "")
+
+	def get_hedge_delay(self) -> float | None:
+		# None lets the delay follow the main server's recent latencies.
+		return self.data.get("hedge_delay")
+
+	def get_breaker_settings(self) -> dict[str, Any]:
+		return {
+			"threshold": self.data.get("breaker_threshold", DEFAULT_BREAKER_THRESHOLD),
+			"cooldown": self.data.get("breaker_cooldown", DEFAULT_BREAKER_COOLDOWN),
+		}
+
+
+_instance: ConfigManager | None = None
+_instance_lock = threading.Lock()
+
+
+def get_config() -> ConfigManager:
+	"""The process-wide configuration, loaded on first use."""
+	global _instance
+	with _instance_lock:
+		if _instance is None:
+			_instance = ConfigManager()
+		return _instance
@@ -0,0 +1,104 @@
+import gzip
+import http.client
+import threading
+from urllib import parse
+from .diagnostics import span
+
+# Errors that mean a reused keep-alive connection was closed by the server.
+_STALE_CONNECTION_ERRORS = (
+	http.client.RemoteDisconnected,
+	http.client.BadStatusLine,
+	BrokenPipeError,
+	ConnectionResetError,
+	ConnectionAbortedError,
+)
+
+
+class ConnectionPool:
+	"""Thread-safe pool of persistent HTTP(S) connections, keyed by host."""
+
+	def __init__(self, timeout: float, max_idle_per_host: int = 4):
+		super().__init__()
+		self.timeout = timeout
+		self.max_idle_per_host = max_idle_per_host
+		self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+		self._lock = threading.Lock()
+
+	def get(self, url: str, headers: dict[str, str]) -> tuple[int, bytes]:
+		parts = parse.urlsplit(url)
+		key = (parts.scheme, parts.netloc)
+		path = parts.path or "/"
+		if parts.query:
+			path += f"?{parts.query}"
+		headers = dict(headers)
+		headers.setdefault("Accept-Encoding", "gzip")
+
+		conn, reused = self._acquire(key)
+		try:
+			status, body, keep_alive = self._request(conn, path, headers)
+		except _STALE_CONNECTION_ERRORS:
+			conn.close()
+			if not reused:
+				raise
+			# The idle connection went away; retry once on a fresh one.
+			conn = self._new_connection(key)
+			try:
+				status, body, keep_alive = self._request(conn, path, headers)
+			except Exception:
+				conn.close()
+				raise
+		except Exception:
+			conn.close()
+			raise
+		if keep_alive:
+			self._release(key, conn)
+		else:
+			conn.close()
+		return status, body
+
+	def close(self):
+		with self._lock:
+			idle, self._idle = self._idle, {}
+		for conns in idle.values():
+			for conn in conns:
+				conn.close()
+
+	def _request(
+		self,
+		conn: http.client.HTTPConnection,
+		path: str,
+		headers: dict[str, str],
+	) -> tuple[int, bytes, bool]:
+		if conn.sock is None:
+			# Connect explicitly so DNS, TCP and TLS time is told apart from server time.
+			with span("connect"):
+				conn.connect()
+		with span("first_byte"):
+			conn.request("GET", path, headers=headers)
+			response = conn.getresponse()
+		with span("download"):
+			body = response.read()
+			if response.getheader("Content-Encoding", "").lower() == "gzip":
+				body = gzip.decompress(body)
+		return response.status, body, not response.will_close
+
+	def _acquire(self, key: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+		with self._lock:
+			conns = self._idle.get(key)
+			if conns:
+				return conns.pop(), True
+		return self._new_connection(key), False
+
+	def _release(self, key: tuple[str, str], conn: http.client.HTTPConnection):
+		with self._lock:
+			conns = self._idle.setdefault(key, [])
+			if len(conns) < self.max_idle_per_host:
+				conns.append(conn)
+				return
+		conn.close()
+
+	def _new_connection(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+		scheme, netloc = key
+		if scheme == "https":
+			return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+		return http.client.HTTPConnection(netloc, timeout=self.timeout)
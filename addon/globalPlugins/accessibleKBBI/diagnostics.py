@@ -0,0 +1,190 @@
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+
+# Recent samples kept per timing; older ones drop out of the statistics.
+HISTORY_SIZE = 200
+# Upper bounds, in milliseconds, of the histogram buckets; the last bucket is unbounded.
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+# Parts of a lookup in the order they happen: network (connect to download), parse on
+# the lookup thread, format and render on the UI thread.
+LOOKUP_SPANS = ("connect", "first_byte", "download", "parse", "format", "render")
+
+_timings: dict[str, deque[float]] = {}
+_cache_hits: deque[bool] = deque(maxlen=HISTORY_SIZE)
+# Words fetched in the background, and how many of them were looked up afterwards.
+_prefetch = {"prefetched": 0, "used": 0}
+_lock = threading.Lock()
+
+
+class _Local(threading.local):
+	# Spans being collected on this thread; a class default spares threads that never
+	# collect a failed attribute lookup on every span.
+	spans: dict[str, float] | None = None
+
+
+_local = _Local()
+
+
+class _UnrecordedSpans(dict[str, float]):
+	"""Spans of background work, kept out of the histograms of user lookups."""
+
+
+def _add(name: str, seconds: float):
+	samples = _timings.get(name)
+	if samples is None:
+		with _lock:
+			samples = _timings.setdefault(name, deque(maxlen=HISTORY_SIZE))
+	# Appending to a deque is atomic, so the common path takes no lock.
+	samples.append(seconds)
+
+
+def record(name: str, seconds: float):
+	"""Record one duration, in seconds, under the given name."""
+	_add(name, seconds)
+	logging.debug(f"KBBI {name}: {seconds * 1000:.1f} ms")
+
+
+@contextmanager
+def measure(name: str) -> Generator[None, None, None]:
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		record(name, time.perf_counter() - start)
+
+
+@contextmanager
+def collect(
+	spans: dict[str, float] | None = None,
+	record: bool = True,
+) -> Generator[dict[str, float], None, None]:
+	"""Gather the spans measured on this thread into a dict, e.g. for one lookup.
+
+	Passing the dict of another thread lets work it hands off add to the same spans.
+	With record False, as for prefetching, the spans are not added to the histograms.
+	"""
+	previous = _local.spans
+	if spans is None:
+		spans = {} if record else _UnrecordedSpans()
+	_local.spans = spans
+	try:
+		yield _local.spans
+	finally:
+		_local.spans = previous
+
+
+def current_spans() -> dict[str, float] | None:
+	return _local.spans
+
+
+def add_span(name: str, seconds: float, spans: dict[str, float] | None = None):
+	"""Add a part of a lookup to its histogram and to the spans being collected.
+
+	Repeated spans, such as connecting again on a retry, add up.
+	"""
+	if spans is None:
+		spans = current_spans()
+	if not isinstance(spans, _UnrecordedSpans):
+		_add(name, seconds)
+	if spans is not None:
+		with _lock:
+			spans[name] = spans.get(name, 0.0) + seconds
+
+
+@contextmanager
+def span(name: str, spans: dict[str, float] | None = None) -> Generator[None, None, None]:
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		add_span(name, time.perf_counter() - start, spans)
+
+
+def record_cache(hit: bool):
+	with _lock:
+		_cache_hits.append(hit)
+
+
+def record_prefetch(used: bool):
+	"""Count a word prefetched in the background, or, with used, a later lookup of one."""
+	with _lock:
+		_prefetch["used" if used else "prefetched"] += 1
+
+
+def log_lookup(query: str, spans: dict[str, float]):
+	if not logging.getLogger().isEnabledFor(logging.DEBUG):
+		return
+	parts = [f"{name} {spans[name] * 1000:.1f} ms" for name in LOOKUP_SPANS if name in spans]
+	logging.debug(f"KBBI lookup {query!r}: {', '.join(parts) or 'no spans'}")
+
+
+def timings() -> dict[str, list[float]]:
+	with _lock:
+		return {name: list(values) for name, values in _timings.items()}
+
+
+def _histogram(samples: list[float]) -> list[int]:
+	counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+	for seconds in samples:
+		ms = seconds * 1000
+		index = next((i for i, bound in enumerate(BUCKET_BOUNDS_MS) if ms <= bound), len(BUCKET_BOUNDS_MS))
+		counts[index] += 1
+	return counts
+
+
+def _describe(samples: list[float]) -> dict[str, Any]:
+	ordered = sorted(samples)
+
+	def ms(seconds: float) -> float:
+		return round(seconds * 1000, 3)
+
+	return {
+		"count": len(ordered),
+		"mean_ms": ms(statistics.fmean(ordered)),
+		"p50_ms": ms(ordered[int(0.5 * (len(ordered) - 1))]),
+		"p90_ms": ms(ordered[int(0.9 * (len(ordered) - 1))]),
+		"p95_ms": ms(ordered[int(0.95 * (len(ordered) - 1))]),
+		"max_ms": ms(ordered[-1]),
+		"histogram": _histogram(ordered),
+	}
+
+
+def snapshot() -> dict[str, Any]:
+	"""Statistics of the recent samples of every timing, and the recent cache hit ratio."""
+	with _lock:
+		samples = {name: list(values) for name, values in _timings.items() if values}
+		hits = list(_cache_hits)
+		prefetched, used = _prefetch["prefetched"], _prefetch["used"]
+	return {
+		"history_size": HISTORY_SIZE,
+		"bucket_bounds_ms": list(BUCKET_BOUNDS_MS),
+		"timings": {name: _describe(values) for name, values in sorted(samples.items())},
+		"cache": {
+			"lookups": len(hits),
+			"hits": sum(hits),
+			"hit_ratio": sum(hits) / len(hits) if hits else 0.0,
+		},
+		"prefetch": {
+			"prefetched": prefetched,
+			"used": used,
+			"hit_rate": used / prefetched if prefetched else 0.0,
+		},
+	}
+
+
+def export_json() -> str:
+	return json.dumps(snapshot(), indent=2)
+
+
+def clear():
+	with _lock:
+		_timings.clear()
+		_cache_hits.clear()
+		_prefetch.update(prefetched=0, used=0)
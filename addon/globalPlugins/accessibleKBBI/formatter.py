@@ -0,0 +1,226 @@
+import html
+import unicodedata
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+from .models import Definition, Entry, KBBIResult
+
+FORMAT_TEXT = "text"
+FORMAT_MARKDOWN = "markdown"
+FORMAT_HTML = "html"
+FORMAT_DEFINITIONS = "definitions"
+
+
+def _nfkc(text: str) -> str:
+	# Most KBBI text is already normalized, and ASCII always is; checking avoids a copy.
+	if text.isascii() or unicodedata.is_normalized("NFKC", text):
+		return text
+	return unicodedata.normalize("NFKC", text)
+
+
+def _nfkc_all(texts: tuple[str, ...]) -> tuple[str, ...]:
+	if "".join(texts).isascii() or all(unicodedata.is_normalized("NFKC", t) for t in texts):
+		return texts
+	return tuple(unicodedata.normalize("NFKC", t) for t in texts)
+
+
+def _normalize_definition(d: Definition) -> Definition:
+	definition = _nfkc(d.definition)
+	referenced = _nfkc(d.referencedLemma)
+	examples = _nfkc_all(d.usageExamples)
+	if definition is d.definition and referenced is d.referencedLemma and examples is d.usageExamples:
+		return d
+	return Definition(definition, referenced, d.labels, examples)
+
+
+def _normalize_entry(entry: Entry) -> Entry:
+	# Already normalized strings and tuples are shared with the original, not copied.
+	return Entry(
+		_nfkc(entry.entry),
+		_nfkc(entry.baseWord),
+		_nfkc(entry.pronunciation),
+		definitions=tuple(_normalize_definition(d) for d in entry.definitions),
+		derivedWords=_nfkc_all(entry.derivedWords),
+		compoundWords=_nfkc_all(entry.compoundWords),
+		metaphors=_nfkc_all(entry.metaphors),
+		proverbs=_nfkc_all(entry.proverbs),
+	)
+
+
+def normalized(res: KBBIResult) -> KBBIResult:
+	"""NFKC-normalized form of the result, computed once and cached on it."""
+	if res.normalized is None:
+		entries = [_normalize_entry(entry) for entry in res.entries]
+		res.normalized = KBBIResult(lemma=_nfkc(res.lemma), entries=entries)
+		res.normalized.normalized = res.normalized
+	return res.normalized
+
+
+def _label_codes(definition: Definition) -> str:
+	return ", ".join(lbl.code for lbl in definition.labels)
+
+
+def _word_sections(entry: Entry) -> tuple[tuple[str, tuple[str, ...]], ...]:
+	return (
+		("Kata Turunan", entry.derivedWords),
+		("Gabungan Kata", entry.compoundWords),
+		("Peribahasa", entry.proverbs),
+	)
+
+
+# Each renderer returns the entry's main lines (headword, base word, definitions)
+# and the lines of its word-list sections, so long lists can be rendered later.
+EntryLines = tuple[list[str], list[str]]
+
+
+def _text_entry(entry: Entry) -> EntryLines:
+	head = entry.entry
+	if entry.pronunciation:
+		head += f"  /{entry.pronunciation}/"
+	lines = [head]
+	if entry.baseWord:
+		lines.append(f"  Kata Dasar: {entry.baseWord}")
+	if entry.definitions:
+		lines.append("  Definisi:")
+		for i, definition in enumerate(entry.definitions, 1):
+			labels = _label_codes(definition)
+			label_part = f"[{labels}] " if labels else ""
+			lines.append(f"    {i}. {label_part}{definition.definition}")
+			if definition.usageExamples:
+				lines.append(f"       Contoh: {'; '.join(definition.usageExamples)}")
+	sections = [f"  {title}: " + ", ".join(words) for title, words in _word_sections(entry) if words]
+	return lines, sections
+
+
+def _markdown_entry(entry: Entry) -> EntryLines:
+	head = f"## {entry.entry}"
+	if entry.pronunciation:
+		head += f" /{entry.pronunciation}/"
+	lines = [head]
+	if entry.baseWord:
+		lines += ["", f"**Kata Dasar:** {entry.baseWord}"]
+	if entry.definitions:
+		lines.append("")
+	for i, definition in enumerate(entry.definitions, 1):
+		labels = _label_codes(definition)
+		label_part = f"*{labels}* " if labels else ""
+		lines.append(f"{i}. {label_part}{definition.definition}")
+		if definition.usageExamples:
+			lines.append(f"   Contoh: _{'; '.join(definition.usageExamples)}_")
+	sections = []
+	for title, words in _word_sections(entry):
+		if words:
+			sections += ["", f"**{title}:** " + ", ".join(words)]
+	return lines, sections
+
+
+def _html_entry(entry: Entry) -> EntryLines:
+	esc = html.escape
+	head = f"<h2>{esc(entry.entry)}"
+	if entry.pronunciation:
+		head += f" <span>/{esc(entry.pronunciation)}/</span>"
+	lines = [head + "</h2>"]
+	if entry.baseWord:
+		lines.append(f"<p>Kata Dasar: {esc(entry.baseWord)}</p>")
+	if entry.definitions:
+		lines.append("<ol>")
+		for definition in entry.definitions:
+			labels = _label_codes(definition)
+			label_part = f"<i>{esc(labels)}</i> " if labels else ""
+			item = f"<li>{label_part}{esc(definition.definition)}"
+			if definition.usageExamples:
+				item += f"<br>Contoh: {esc('; '.join(definition.usageExamples))}"
+			lines.append(item + "</li>")
+		lines.append("</ol>")
+	sections = [f"<p>{title}: {esc(', '.join(words))}</p>" for title, words in _word_sections(entry) if words]
+	return lines, sections
+
+
+def _definitions_entry(entry: Entry) -> EntryLines:
+	lines = [entry.entry]
+	for i, definition in enumerate(entry.definitions, 1):
+		labels = _label_codes(definition)
+		label_part = f"[{labels}] " if labels else ""
+		lines.append(f"  {i}. {label_part}{definition.definition}")
+	return lines, []
+
+
+_ENTRY_RENDERERS: dict[str, Callable[[Entry], EntryLines]] = {
+	FORMAT_TEXT: _text_entry,
+	FORMAT_MARKDOWN: _markdown_entry,
+	FORMAT_HTML: _html_entry,
+	FORMAT_DEFINITIONS: _definitions_entry,
+}
+
+
+def render_entry(res: KBBIResult, index: int, fmt: str = FORMAT_TEXT) -> str:
+	"""Render the entry at index of the result on its own."""
+	lines, sections = _ENTRY_RENDERERS[fmt](normalized(res).entries[index])
+	return "\n".join(lines + sections)
+
+
+def render(res: KBBIResult, fmt: str = FORMAT_TEXT) -> str:
+	return "".join(render_chunks(res, fmt))
+
+
+def render_chunks(res: KBBIResult, fmt: str = FORMAT_TEXT) -> Iterator[str]:
+	"""Render the result piece by piece: each entry's main part, then its word lists.
+
+	Joining the pieces with no separator gives the same text as render().
+	"""
+	renderer = _ENTRY_RENDERERS[fmt]
+	for index, entry in enumerate(normalized(res).entries):
+		lines, sections = renderer(entry)
+		prefix = "\n\n" if index else ""
+		yield prefix + "\n".join(lines)
+		if sections:
+			yield "\n" + "\n".join(sections)
+
+
+def summary(res: KBBIResult) -> str:
+	"""The first definition with its label codes, short enough to be spoken."""
+	for entry in normalized(res).entries:
+		if entry.definitions:
+			definition = entry.definitions[0]
+			labels = _label_codes(definition)
+			head = f"{entry.entry}, {labels}" if labels else entry.entry
+			return f"{head}: {definition.definition}"
+	return normalized(res).lemma
+
+
+ROW_ENTRY = "entry"
+ROW_DEFINITION = "definition"
+ROW_SECTION = "section"
+ROW_WORD = "word"
+
+
+class Row(NamedTuple):
+	kind: str
+	text: str
+	# Lemma to look up when the row is activated, if any.
+	word: str = ""
+
+
+def result_rows(res: KBBIResult) -> list[Row]:
+	"""Flatten the result into rows for a navigable list view."""
+	rows: list[Row] = []
+	for entry in normalized(res).entries:
+		head = entry.entry
+		if entry.pronunciation:
+			head += f"  /{entry.pronunciation}/"
+		if entry.baseWord:
+			head += f"  (Kata Dasar: {entry.baseWord})"
+		rows.append(Row(ROW_ENTRY, head, entry.baseWord))
+		for i, definition in enumerate(entry.definitions, 1):
+			labels = _label_codes(definition)
+			text = f"{i}. [{labels}] {definition.definition}" if labels else f"{i}. {definition.definition}"
+			if definition.usageExamples:
+				text += f" Contoh: {'; '.join(definition.usageExamples)}"
+			rows.append(Row(ROW_DEFINITION, text, definition.referencedLemma))
+		for title, words in _word_sections(entry):
+			if not words:
+				continue
+			rows.append(Row(ROW_SECTION, f"{title} ({len(words)})"))
+			# Proverbs are phrases, not lemmas that can be looked up.
+			lookup = title != "Peribahasa"
+			rows.extend(Row(ROW_WORD, w, w if lookup else "") for w in words)
+	return rows
@@ -0,0 +1,125 @@
+import time
+from collections.abc import Iterable
+from .cache import normalize_query
+
+# Prefixes with the initial consonant they may have absorbed (meN- and peN- assimilation).
+_PREFIXES: tuple[tuple[str, tuple[str, ...]], ...] = (
+	("memper", ("",)),
+	("member", ("",)),
+	("meng", ("", "k")),
+	("meny", ("s",)),
+	("mem", ("", "p")),
+	("men", ("", "t")),
+	("me", ("",)),
+	("peng", ("", "k")),
+	("peny", ("s",)),
+	("pem", ("", "p")),
+	("pen", ("", "t")),
+	("per", ("",)),
+	("pe", ("",)),
+	("ber", ("",)),
+	("be", ("",)),
+	("ter", ("",)),
+	("di", ("",)),
+	("ke", ("",)),
+	("se", ("",)),
+)
+_PARTICLES = ("lah", "kah", "pun")
+_POSSESSIVES = ("nya", "ku", "mu")
+_SUFFIXES = ("kan", "an", "i")
+_MIN_STEM = 3
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz-"
+
+
+def _strip_suffixes(word: str) -> set[str]:
+	forms = {word}
+	for group in (_PARTICLES, _POSSESSIVES, _SUFFIXES):
+		for form in list(forms):
+			for suffix in group:
+				if form.endswith(suffix) and len(form) - len(suffix) >= _MIN_STEM:
+					forms.add(form[: -len(suffix)])
+	return forms
+
+
+def _strip_prefixes(word: str) -> set[str]:
+	stems = set()
+	for prefix, restores in _PREFIXES:
+		if not word.startswith(prefix):
+			continue
+		rest = word[len(prefix) :]
+		for restore in restores:
+			stem = restore + rest
+			if len(stem) >= _MIN_STEM:
+				stems.add(stem)
+	return stems
+
+
+def stem_candidates(word: str) -> set[str]:
+	"""Possible base words of an Indonesian word, by stripping common affixes."""
+	word = normalize_query(word)
+	stems = set()
+	for form in _strip_suffixes(word):
+		stems.add(form)
+		# Prefixes stack at most two deep, as in mem-per-, di-per- or pem-be(l)-.
+		for stem in _strip_prefixes(form):
+			stems.add(stem)
+			stems.update(_strip_prefixes(stem))
+	stems.discard(word)
+	return stems
+
+
+def edits(word: str) -> set[str]:
+	"""All strings one deletion, transposition, substitution or insertion away."""
+	splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+	deletes = [a + b[1:] for a, b in splits if b]
+	transposes = [a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1]
+	replaces = [a + c + b[1:] for a, b in splits if b for c in _ALPHABET]
+	inserts = [a + c + b for a, b in splits for c in _ALPHABET]
+	return set(deletes + transposes + replaces + inserts)
+
+
+class FuzzyMatcher:
+	"""Approximate lemma lookup by generating edits of the query.
+
+	Only a set of the known words is kept, so memory is linear in the word list and
+	nothing is precomputed per word; distance-2 candidates are explored within a
+	time budget.
+	"""
+
+	def __init__(self, words: Iterable[str]):
+		super().__init__()
+		self._words = frozenset(words)
+
+	def __contains__(self, word: str) -> bool:
+		return word in self._words
+
+	def __len__(self) -> int:
+		return len(self._words)
+
+	def suggest(self, query: str, limit: int = 5, budget: float = 0.05) -> list[str]:
+		query = normalize_query(query)
+		if not query:
+			return []
+		deadline = time.perf_counter() + budget
+		# Base words found by affix stripping rank first, longest stem first.
+		results = sorted((s for s in stem_candidates(query) if s in self._words), key=lambda s: (-len(s), s))
+		seen = set(results)
+		seen.add(query)
+
+		first_edits = edits(query)
+		found = self._rank(query, (w for w in first_edits if w in self._words and w not in seen))
+		results += found
+		seen.update(found)
+		if len(results) < limit:
+			second: set[str] = set()
+			for edit in first_edits:
+				if time.perf_counter() > deadline:
+					break
+				second.update(w for w in edits(edit) if w in self._words and w not in seen)
+			results += self._rank(query, second)
+		return results[:limit]
+
+	@staticmethod
+	def _rank(query: str, words: Iterable[str]) -> list[str]:
+		# Prefer words that keep the first letter and the length of what was typed.
+		return sorted(words, key=lambda w: (w[:1] != query[:1], abs(len(w) - len(query)), w))
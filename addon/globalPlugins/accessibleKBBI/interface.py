@@ -1,18 +1,54 @@
+import os
 import wx
+import itertools
 import threading
+import time
 import addonHandler
 import ui as nvdaUI
 import api
 import tones
-import unicodedata
-from collections.abc import Callable
-from .client import KBBIClient
-from .config import ConfigManager
+from collections.abc import Callable, Iterator
+from typing import Any
+from .diagnostics import LOOKUP_SPANS, log_lookup, span
+from .diagnostics import clear as clear_diagnostics
+from .diagnostics import export_json as export_diagnostics
+from .diagnostics import snapshot as diagnostics_snapshot
+from .formatter import (
+	FORMAT_DEFINITIONS,
+	FORMAT_HTML,
+	FORMAT_MARKDOWN,
+	FORMAT_TEXT,
+	ROW_ENTRY,
+	ROW_SECTION,
+	ROW_WORD,
+	Row,
+	normalized,
+	render,
+	render_chunks,
+	result_rows,
+)
+from .batch import BatchItem, summarize, tokenize
+from .cache import normalize_query
+from .client import EntryNotFoundError, KBBIClient
+from .config import get_config
+from .fuzzy import FuzzyMatcher
+from .lookup import create_client
 from .models import KBBIResult
+from .prefetch import Prefetcher
+from .scheduler import LookupScheduler
+from .suggest import PrefixIndex
 
 addonHandler.initTranslation()
 _ = wx.GetTranslation
 
+# Rendered pieces (an entry's main part or its word lists) appended per UI event.
+RENDER_BATCH_SIZE = 4
+
+# Entries of the result view choice.
+VIEW_FULL = 0
+VIEW_DEFINITIONS = 1
+VIEW_STRUCTURED = 2
+
 
 class SelectionDialog(wx.Dialog):
 	def __init__(
@@ -95,6 +131,331 @@ class SelectionDialog(wx.Dialog):
 			dlg.Destroy()
 
 
+class ResultListCtrl(wx.ListCtrl):
+	"""Virtual list of result rows; only rows on screen are ever asked for their text.
+
+	Keys: E and S jump to the next entry or section, P to the proverbs, with Shift
+	going backwards; Enter looks up the word on the focused row.
+	"""
+
+	def __init__(self, parent: wx.Window, on_activate: Callable[[str], None]):
+		super(ResultListCtrl, self).__init__(
+			parent,
+			style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL | wx.LC_NO_HEADER,
+		)
+		self.on_activate = on_activate
+		self.rows: list[Row] = []
+		self.InsertColumn(0, _("Hasil"), width=640)
+		self.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_item_activated)
+		self.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
+
+	def set_rows(self, rows: list[Row]):
+		self.rows = rows
+		self.SetItemCount(len(rows))
+		self.Refresh()
+		if rows:
+			self._move_to(0)
+
+	def OnGetItemText(self, item: int, column: int) -> str:
+		row = self.rows[item]
+		if row.kind == ROW_WORD:
+			return f"  {row.text}"
+		return row.text
+
+	def on_item_activated(self, event: wx.ListEvent):
+		row = self.rows[event.GetIndex()]
+		if row.word:
+			self.on_activate(row.word)
+
+	def on_key_down(self, event: wx.KeyEvent):
+		backwards = event.ShiftDown()
+		key = event.GetKeyCode()
+		if event.ControlDown() or event.AltDown():
+			event.Skip()
+		elif key == ord("E"):
+			self._jump(lambda row: row.kind == ROW_ENTRY, backwards)
+		elif key == ord("S"):
+			self._jump(lambda row: row.kind in (ROW_ENTRY, ROW_SECTION), backwards)
+		elif key == ord("P"):
+			self._jump(
+				lambda row: row.kind == ROW_SECTION and row.text.startswith("Peribahasa"),
+				backwards,
+			)
+		else:
+			event.Skip()
+
+	def _jump(self, matches: Callable[[Row], bool], backwards: bool):
+		current = self.GetFocusedItem()
+		indexes = range(current - 1, -1, -1) if backwards else range(current + 1, len(self.rows))
+		for index in indexes:
+			if matches(self.rows[index]):
+				self._move_to(index)
+				return
+		tones.beep(400, 50)
+
+	def _move_to(self, index: int):
+		self.Select(index)
+		self.Focus(index)
+		self.EnsureVisible(index)
+
+
+class GlossaryDialog(wx.Dialog):
+	def __init__(
+		self,
+		parent: wx.Window,
+		client: KBBIClient,
+		words: list[str],
+		on_activate: Callable[[str], None] | None = None,
+	):
+		super(GlossaryDialog, self).__init__(
+			parent,
+			title=_("Glosarium"),
+			size=(700, 550),
+			style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
+		)
+		self.client = client
+		self.words = words
+		self.on_activate = on_activate
+		self.items: list[BatchItem] = []
+		self._closed = False
+		self._start = time.perf_counter()
+
+		sizer = wx.BoxSizer(wx.VERTICAL)
+
+		self.status_label = wx.StaticText(self, label=_("Memuat..."))
+		sizer.Add(self.status_label, 0, wx.EXPAND | wx.ALL, 10)
+
+		self.list_ctrl = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+		self.list_ctrl.InsertColumn(0, _("Kata"), width=150)
+		self.list_ctrl.InsertColumn(1, _("Definisi"), width=420)
+		self.list_ctrl.InsertColumn(2, _("Waktu (md)"), width=90)
+		self.list_ctrl.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_item_selected)
+		self.list_ctrl.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_item_activated)
+		sizer.Add(self.list_ctrl, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+
+		self.detail_area = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY)
+		sizer.Add(self.detail_area, 1, wx.EXPAND | wx.ALL, 10)
+
+		close_btn = wx.Button(self, wx.ID_CANCEL, label=_("Tutup"))
+		# A modeless dialog's Cancel button and Escape only hide it; close it so the lookups stop.
+		close_btn.Bind(wx.EVT_BUTTON, self.on_close_button)
+		sizer.Add(close_btn, 0, wx.ALIGN_RIGHT | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
+		self.SetSizer(sizer)
+		self.Bind(wx.EVT_CHAR_HOOK, self.on_char_hook)
+		self.Bind(wx.EVT_CLOSE, self.on_close)
+		self.list_ctrl.SetFocus()
+
+		threading.Thread(target=self._worker, daemon=True).start()
+
+	def _worker(self):
+		self.client.search_many(
+			self.words,
+			on_result=self._on_result,
+			is_cancelled=lambda: self._closed,
+		)
+		wx.CallAfter(self._on_done)
+
+	def _on_result(self, item: BatchItem):
+		# Called on the lookup threads.
+		wx.CallAfter(self._add_item, item)
+
+	def _add_item(self, item: BatchItem):
+		# The dialog may be gone with its parent without receiving a close event.
+		if self._closed or not self:
+			return
+		if item.result and item.result.entries and item.result.entries[0].definitions:
+			summary = item.result.entries[0].definitions[0].definition
+		else:
+			summary = item.error
+		row = self.list_ctrl.GetItemCount()
+		self.list_ctrl.InsertItem(row, item.word)
+		self.list_ctrl.SetItem(row, 1, summary)
+		self.list_ctrl.SetItem(row, 2, "-" if item.cached else f"{item.elapsed * 1000:.0f}")
+		self.items.append(item)
+		self._update_status()
+		if row == 0:
+			self.list_ctrl.Select(0)
+			self.list_ctrl.Focus(0)
+
+	def _update_status(self, done: bool = False):
+		stats = summarize(self.items, time.perf_counter() - self._start)
+		status = _("{done} dari {total} kata, {rate:.1f} kata/detik").format(
+			done=stats["words"],
+			total=len(self.words),
+			rate=stats["words_per_sec"],
+		)
+		if done:
+			status += ", " + _("median {p50:.0f} md, p95 {p95:.0f} md").format(
+				p50=stats["latency_p50"] * 1000,
+				p95=stats["latency_p95"] * 1000,
+			)
+		self.status_label.SetLabel(status)
+
+	def _on_done(self):
+		if self._closed or not self:
+			return
+		self._update_status(done=True)
+		nvdaUI.message(_("Glosarium selesai."))
+
+	def on_item_selected(self, event: wx.ListEvent):
+		item = self.items[event.GetIndex()]
+		if item.result:
+			self.detail_area.SetValue(render(item.result))
+		else:
+			self.detail_area.SetValue(item.error)
+
+	def on_item_activated(self, event: wx.ListEvent):
+		item = self.items[event.GetIndex()]
+		if self.on_activate:
+			self.on_activate(item.word)
+			self.Close()
+
+	def on_close_button(self, event: wx.CommandEvent):
+		self.Close()
+
+	def on_char_hook(self, event: wx.KeyEvent):
+		if event.GetKeyCode() == wx.WXK_ESCAPE:
+			self.Close()
+		else:
+			event.Skip()
+
+	def on_close(self, event: wx.CloseEvent):
+		self._closed = True
+		self.Destroy()
+
+
+class DiagnosticsDialog(wx.Dialog):
+	"""Timing statistics of recent lookups, for finding out where a slow lookup spends its time."""
+
+	def __init__(self, parent: wx.Window):
+		super(DiagnosticsDialog, self).__init__(
+			parent,
+			title=_("Diagnostik"),
+			size=(600, 500),
+			style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
+		)
+		sizer = wx.BoxSizer(wx.VERTICAL)
+
+		self.text_area = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY)
+		sizer.Add(self.text_area, 1, wx.EXPAND | wx.ALL, 10)
+
+		btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		refresh_btn = wx.Button(self, label=_("Perbarui"))
+		refresh_btn.Bind(wx.EVT_BUTTON, self.on_refresh)
+		btn_sizer.Add(refresh_btn, 0, wx.RIGHT, 5)
+		copy_btn = wx.Button(self, label=_("Salin JSON"))
+		copy_btn.Bind(wx.EVT_BUTTON, self.on_copy_json)
+		btn_sizer.Add(copy_btn, 0, wx.RIGHT, 5)
+		save_btn = wx.Button(self, label=_("Simpan JSON..."))
+		save_btn.Bind(wx.EVT_BUTTON, self.on_save_json)
+		btn_sizer.Add(save_btn, 0, wx.RIGHT, 5)
+		clear_btn = wx.Button(self, label=_("Atur Ulang"))
+		clear_btn.Bind(wx.EVT_BUTTON, self.on_clear)
+		btn_sizer.Add(clear_btn, 0, wx.RIGHT, 5)
+		close_btn = wx.Button(self, wx.ID_CANCEL, label=_("Tutup"))
+		close_btn.Bind(wx.EVT_BUTTON, self.on_close_button)
+		btn_sizer.Add(close_btn, 0)
+		sizer.Add(btn_sizer, 0, wx.ALIGN_RIGHT | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
+		self.SetSizer(sizer)
+		self.Bind(wx.EVT_CHAR_HOOK, self.on_char_hook)
+		self.Bind(wx.EVT_CLOSE, self.on_close)
+		self.refresh()
+		self.text_area.SetFocus()
+
+	def refresh(self):
+		self.text_area.SetValue(self._describe(diagnostics_snapshot()))
+		self.text_area.SetInsertionPoint(0)
+
+	@staticmethod
+	def _describe(snapshot: dict[str, Any]) -> str:
+		cache = snapshot["cache"]
+		lines = [
+			_("Cache: {ratio:.0%} dari {count} pencarian terakhir.").format(
+				ratio=cache["hit_ratio"],
+				count=cache["lookups"],
+			),
+		]
+		prefetch = snapshot["prefetch"]
+		if prefetch["prefetched"]:
+			lines.append(
+				_("Muat awal: {used} dari {count} kata dicari kemudian ({rate:.0%}).").format(
+					used=prefetch["used"],
+					count=prefetch["prefetched"],
+					rate=prefetch["hit_rate"],
+				),
+			)
+		timings = snapshot["timings"]
+		if not timings:
+			lines.append(_("Belum ada pengukuran."))
+		# Lookup spans first, in the order they happen, then the rest by name.
+		names = [n for n in LOOKUP_SPANS if n in timings]
+		names += [n for n in timings if n not in LOOKUP_SPANS]
+		bounds = [f"≤{b}" for b in snapshot["bucket_bounds_ms"]] + [f">{snapshot['bucket_bounds_ms'][-1]}"]
+		for name in names:
+			stats = timings[name]
+			lines.append("")
+			lines.append(
+				_("{name}: {count} kali, median {p50} md, p95 {p95} md, maks {max} md").format(
+					name=name,
+					count=stats["count"],
+					p50=f"{stats['p50_ms']:.1f}",
+					p95=f"{stats['p95_ms']:.1f}",
+					max=f"{stats['max_ms']:.1f}",
+				),
+			)
+			buckets = [f"{bound} md: {count}" for bound, count in zip(bounds, stats["histogram"]) if count]
+			lines.append("  " + ", ".join(buckets))
+		return "\n".join(lines)
+
+	def on_refresh(self, event: wx.CommandEvent):
+		self.refresh()
+
+	def on_close_button(self, event: wx.CommandEvent):
+		self.Close()
+
+	def on_close(self, event: wx.CloseEvent):
+		self.Destroy()
+
+	def on_char_hook(self, event: wx.KeyEvent):
+		# Escape would only hide this modeless dialog; close it so it is destroyed.
+		if event.GetKeyCode() == wx.WXK_ESCAPE:
+			self.Close()
+		else:
+			event.Skip()
+
+	def on_copy_json(self, event: wx.CommandEvent):
+		if api.copyToClip(export_diagnostics()):
+			nvdaUI.message(_("Disalin ke papan klip."))
+		else:
+			nvdaUI.message(_("Gagal menyalin."))
+
+	def on_save_json(self, event: wx.CommandEvent):
+		with wx.FileDialog(
+			self,
+			_("Simpan diagnostik"),
+			defaultFile="accessibleKBBI-diagnostics.json",
+			wildcard=_("Berkas JSON") + " (*.json)|*.json",
+			style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+		) as file_dlg:
+			if file_dlg.ShowModal() != wx.ID_OK:
+				return
+			path = file_dlg.GetPath()
+		try:
+			with open(path, "w", encoding="utf-8") as f:
+				f.write(export_diagnostics())
+		except OSError as e:
+			nvdaUI.message(str(e))
+			return
+		nvdaUI.message(_("Disimpan."))
+
+	def on_clear(self, event: wx.CommandEvent):
+		clear_diagnostics()
+		self.refresh()
+		nvdaUI.message(_("Diagnostik diatur ulang."))
+
+
 class KBBIDialog(wx.Dialog):
 	def __init__(self, parent: wx.Window):
 		super(KBBIDialog, self).__init__(
@@ -104,14 +465,25 @@ class KBBIDialog(wx.Dialog):
 			style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
 		)
 
-		self.client = KBBIClient()
-		self.config = ConfigManager()
+		self.config = get_config()
+		self.client = self._create_client()
+		self.scheduler = LookupScheduler(dispatch=wx.CallAfter)
+		self.prefetcher = self._create_prefetcher()
+		self.suggest_index = PrefixIndex()
+		self.suggest_index.rank(self.config.get_history() + self.config.get_favorites())
+		self.fuzzy: FuzzyMatcher | None = None
+		self._render_generation = 0
+		self._suggest_timer: wx.CallLater | None = None
 		self.current_result: KBBIResult | None = None
 		self.Centers()
 
 		self._init_ui()
 		# Ensure result area is clean on start
 		self.result_area.SetValue("")
+		threading.Thread(target=self._build_suggest_index, daemon=True).start()
+
+	def _create_client(self) -> KBBIClient:
+		return create_client(self.config)
 
 	def _init_ui(self):
 		main_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -126,6 +498,8 @@ class KBBIDialog(wx.Dialog):
 
 		self.search_box = wx.TextCtrl(self, style=wx.TE_PROCESS_ENTER)
 		self.search_box.Bind(wx.EVT_TEXT_ENTER, self.on_search_click)
+		self.search_box.Bind(wx.EVT_TEXT, self.on_search_text)
+		self.search_box.Bind(wx.EVT_KEY_DOWN, self.on_search_key)
 		input_sizer.Add(self.search_box, 1, wx.EXPAND)
 
 		self.search_btn = wx.Button(self, label=_("Cari"))
@@ -134,6 +508,15 @@ class KBBIDialog(wx.Dialog):
 
 		main_sizer.Add(input_sizer, 0, wx.EXPAND | wx.ALL, 10)
 
+		# --- Suggestions ---
+		suggest_label = wx.StaticText(self, label=_("Saran:"))
+		main_sizer.Add(suggest_label, 0, wx.LEFT | wx.RIGHT, 10)
+
+		self.suggest_list = wx.ListBox(self, size=(-1, 80))
+		self.suggest_list.Bind(wx.EVT_LISTBOX_DCLICK, self.on_suggestion_select)
+		self.suggest_list.Bind(wx.EVT_KEY_DOWN, self.on_suggestion_key)
+		main_sizer.Add(self.suggest_list, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
+
 		# --- Toolbar ---
 		tool_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -157,13 +540,27 @@ class KBBIDialog(wx.Dialog):
 
 		self.fav_list_btn = wx.Button(self, label=_("Ditandai"))
 		self.fav_list_btn.Bind(wx.EVT_BUTTON, self.on_favorites)
-		tool_sizer.Add(self.fav_list_btn, 1)
+		tool_sizer.Add(self.fav_list_btn, 1, wx.RIGHT, 5)
+
+		self.options_btn = wx.Button(self, label=_("Opsi"))
+		self.options_btn.Bind(wx.EVT_BUTTON, self.on_options_menu)
+		tool_sizer.Add(self.options_btn, 1)
 
 		main_sizer.Add(tool_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
 		# --- Result Display ---
+		result_header = wx.BoxSizer(wx.HORIZONTAL)
 		self.result_label = wx.StaticText(self, label=_("Hasil:"))
-		main_sizer.Add(self.result_label, 0, wx.LEFT | wx.RIGHT, 10)
+		result_header.Add(self.result_label, 1, wx.ALIGN_CENTER_VERTICAL)
+
+		view_label = wx.StaticText(self, label=_("Tampilan:"))
+		result_header.Add(view_label, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+		self.view_choice = wx.Choice(self, choices=[_("Lengkap"), _("Definisi saja"), _("Terstruktur")])
+		self.view_choice.SetSelection(VIEW_FULL)
+		self.view_choice.Bind(wx.EVT_CHOICE, self.on_view_change)
+		result_header.Add(self.view_choice, 0)
+
+		main_sizer.Add(result_header, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
 
 		self.result_area = wx.TextCtrl(
 			self,
@@ -171,6 +568,10 @@ class KBBIDialog(wx.Dialog):
 		)
 		main_sizer.Add(self.result_area, 1, wx.EXPAND | wx.ALL, 10)
 
+		self.result_list = ResultListCtrl(self, self.load_from_history)
+		self.result_list.Hide()
+		main_sizer.Add(self.result_list, 1, wx.EXPAND | wx.ALL, 10)
+
 		# --- Bottom Action Bar ---
 		bottom_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -193,6 +594,61 @@ class KBBIDialog(wx.Dialog):
 		self.SetSizer(main_sizer)
 		self.search_box.SetFocus()
 
+	def _create_prefetcher(self) -> Prefetcher | None:
+		if not self.config.is_prefetch_enabled() or self.client.cache is None:
+			return None
+		return Prefetcher(
+			self.client,
+			max_items=self.config.get_prefetch_count(),
+			is_busy=self.scheduler.is_busy,
+		)
+
+	def _reset_client(self):
+		if self.prefetcher:
+			self.prefetcher.stop()
+		self.client = self._create_client()
+		self.prefetcher = self._create_prefetcher()
+
+	def Destroy(self) -> bool:
+		self.scheduler.shutdown()
+		self.config.flush()
+		if self.prefetcher:
+			self.prefetcher.stop()
+		return super(KBBIDialog, self).Destroy()
+
+	def hide_for_reuse(self):
+		"""Hide instead of closing, so the next open only has to show the window again."""
+		self.scheduler.cancel()
+		if self.prefetcher:
+			self.prefetcher.clear()
+		if self._suggest_timer:
+			self._suggest_timer.Stop()
+		self.config.flush()
+		self.Hide()
+
+	def reopen(self):
+		self.reset(keep_result=self.config.is_keep_last_result_enabled())
+		self.Show()
+		self.Raise()
+		self.search_box.SetFocus()
+
+	def reset(self, keep_result: bool = False):
+		self._enable_controls()
+		self.search_box.ChangeValue("")
+		self.suggest_list.Clear()
+		if keep_result and self.current_result:
+			# A lookup cancelled on hide may have left the loading message behind.
+			self._show_result(self.current_result)
+			return
+		self._render_generation += 1
+		self.current_result = None
+		self._show_text_area()
+		self.result_area.SetValue("")
+		self.result_list.set_rows([])
+		self.toggle_fav_btn.SetLabel(_("Tandai"))
+		self.toggle_fav_btn.Disable()
+		self.copy_btn.Disable()
+
 	def Centers(self):
 		self.CenterOnScreen()
 
@@ -206,20 +662,158 @@ class KBBIDialog(wx.Dialog):
 			event.Skip()
 
 	def on_copy(self, event: wx.CommandEvent):
-		text = self.result_area.GetValue()
-		if text:
-			if api.copyToClip(text):
-				nvdaUI.message(_("Disalin ke papan klip."))
-			else:
-				nvdaUI.message(_("Gagal menyalin."))
+		# Render from the result, as the text area may still be filling in.
+		self.copy_as(self._view_format())
+
+	def _view_format(self) -> str:
+		if self.view_choice.GetSelection() == VIEW_DEFINITIONS:
+			return FORMAT_DEFINITIONS
+		return FORMAT_TEXT
+
+	def _is_structured_view(self) -> bool:
+		return self.view_choice.GetSelection() == VIEW_STRUCTURED
+
+	def _result_control(self) -> wx.Window:
+		if self._is_structured_view() and self.current_result:
+			return self.result_list
+		return self.result_area
+
+	def on_view_change(self, event: wx.CommandEvent):
+		structured = self._is_structured_view() and self.current_result is not None
+		self.result_list.Show(structured)
+		self.result_area.Show(not structured)
+		self.Layout()
+		if self.current_result:
+			self._show_result(self.current_result)
+
+	def _show_result(self, result: KBBIResult, spans: dict[str, float] | None = None):
+		"""Show the result; the time until it can be read is added to spans."""
+		self._render_generation += 1
+		if self._is_structured_view():
+			with span("format", spans):
+				rows = result_rows(result)
+			with span("render", spans):
+				self.result_area.Hide()
+				self.result_list.Show()
+				self.Layout()
+				self.result_list.set_rows(rows)
+			return
+		self._show_text_area()
+		# Show the first entry's headword and definitions at once so speech can start,
+		# then append the rest in batches without blocking the UI thread.
+		chunks = render_chunks(result, self._view_format())
+		with span("format", spans):
+			first = next(chunks, "")
+		with span("render", spans):
+			self.result_area.SetValue(first)
+			self.result_area.SetInsertionPoint(0)
+			self.result_area.ShowPosition(0)
+		wx.CallAfter(self._append_chunks, chunks, self._render_generation)
+
+	def _show_text_area(self):
+		# Loading and error messages always go to the text area.
+		if self.result_list.IsShown():
+			self.result_list.Hide()
+			self.result_area.Show()
+			self.Layout()
+
+	def _append_chunks(self, chunks: Iterator[str], generation: int):
+		if not self or generation != self._render_generation:
+			return
+		batch = "".join(itertools.islice(chunks, RENDER_BATCH_SIZE))
+		if not batch:
+			return
+		position = self.result_area.GetInsertionPoint()
+		self.result_area.Freeze()
+		try:
+			self.result_area.AppendText(batch)
+			# AppendText moves the caret to the end; keep the user's reading position.
+			self.result_area.SetInsertionPoint(position)
+		finally:
+			self.result_area.Thaw()
+		wx.CallAfter(self._append_chunks, chunks, generation)
+
+	def on_copy_markdown(self, event: wx.CommandEvent):
+		self.copy_as(FORMAT_MARKDOWN)
+
+	def on_copy_html(self, event: wx.CommandEvent):
+		self.copy_as(FORMAT_HTML)
+
+	def copy_as(self, fmt: str):
+		if not self.current_result:
+			nvdaUI.message(_("Belum ada hasil."))
+			return
+		if api.copyToClip(render(self.current_result, fmt)):
+			nvdaUI.message(_("Disalin ke papan klip."))
+		else:
+			nvdaUI.message(_("Gagal menyalin."))
 
 	def on_search_click(self, event: wx.CommandEvent | None):
 		query = self.search_box.GetValue().strip()
 		if query:
-			self.do_api_call(lambda: self.client.search(query))
+			if self.prefetcher:
+				self.prefetcher.clear()
+				self.prefetcher.record_lookup(query)
+			self.do_api_call(lambda: self.client.search(query), key=f"search:{normalize_query(query)}")
+
+	def on_search_text(self, event: wx.CommandEvent):
+		event.Skip()
+		# Debounce: only look up completions once typing pauses.
+		if self._suggest_timer:
+			self._suggest_timer.Stop()
+		self._suggest_timer = wx.CallLater(150, self._update_suggestions)
+
+	def _update_suggestions(self):
+		self._suggest_timer = None
+		completions = self.suggest_index.complete(self.search_box.GetValue())
+		self.suggest_list.Set(completions)
+
+	def on_search_key(self, event: wx.KeyEvent):
+		if event.GetKeyCode() == wx.WXK_DOWN and self.suggest_list.GetCount():
+			self.suggest_list.SetSelection(0)
+			self.suggest_list.SetFocus()
+		else:
+			event.Skip()
+
+	def on_suggestion_key(self, event: wx.KeyEvent):
+		if event.GetKeyCode() in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER):
+			self.on_suggestion_select(None)
+		else:
+			event.Skip()
+
+	def on_suggestion_select(self, event: wx.CommandEvent | None):
+		selection = self.suggest_list.GetStringSelection()
+		if selection:
+			self.load_from_history(selection)
+
+	def _build_suggest_index(self):
+		words: list[str] = []
+		if self.client.cache is not None:
+			words += self.client.cache.keys()
+		if os.path.exists(self.config.offline_db_path):
+			try:
+				from .offline import OfflineStore
+
+				store = OfflineStore(self.config.offline_db_path)
+				try:
+					words += store.lemmas()
+				finally:
+					store.close()
+			except Exception:
+				pass
+		index = PrefixIndex(words)
+		index.rank(self.config.get_history() + self.config.get_favorites())
+		fuzzy = FuzzyMatcher(index.words)
+		wx.CallAfter(self._set_suggest_index, index, fuzzy)
+
+	def _set_suggest_index(self, index: PrefixIndex, fuzzy: FuzzyMatcher):
+		# Keep lemmas found while the index was being built.
+		index.rank(self.suggest_index.ranked_words())
+		self.suggest_index = index
+		self.fuzzy = fuzzy
 
 	def on_wotd_click(self, event: wx.CommandEvent):
-		self.do_api_call(self.client.get_wotd)
+		self.do_api_call(self.client.get_wotd, key="wotd")
 
 	def on_random_click(self, event: wx.CommandEvent):
 		self.do_api_call(self.client.get_random)
@@ -238,6 +832,8 @@ class KBBIDialog(wx.Dialog):
 			clear_callback=self.clear_all_history,
 		)
 		dlg.ShowModal()
+		# The main dialog lives for the whole session, so its children are not destroyed with it.
+		dlg.Destroy()
 
 	def delete_history_item(self, lemma: str):
 		self.config.remove_history(lemma)
@@ -258,12 +854,133 @@ class KBBIDialog(wx.Dialog):
 			delete_callback=self.delete_favorite_item,
 		)
 		dlg.ShowModal()
+		dlg.Destroy()
 
 	def delete_favorite_item(self, lemma: str):
 		self.config.remove_favorite(lemma)
 		if self.current_result and self.current_result.lemma == lemma:
 			self.toggle_fav_btn.SetLabel(_("Tandai"))
 
+	def on_options_menu(self, event: wx.CommandEvent):
+		# Handlers are bound to this menu, not the dialog, so they go away with it.
+		menu = wx.Menu()
+		use_item = menu.AppendCheckItem(wx.ID_ANY, _("Gunakan kamus offline"))
+		use_item.Check(self.config.is_offline_mode())
+		use_item.Enable(os.path.exists(self.config.offline_db_path))
+		menu.Bind(wx.EVT_MENU, self.on_toggle_offline, use_item)
+		import_item = menu.Append(wx.ID_ANY, _("Impor berkas kamus..."))
+		menu.Bind(wx.EVT_MENU, self.on_import_dump, import_item)
+		menu.AppendSeparator()
+		markdown_item = menu.Append(wx.ID_ANY, _("Salin sebagai Markdown"))
+		markdown_item.Enable(self.current_result is not None)
+		menu.Bind(wx.EVT_MENU, self.on_copy_markdown, markdown_item)
+		html_item = menu.Append(wx.ID_ANY, _("Salin sebagai HTML"))
+		html_item.Enable(self.current_result is not None)
+		menu.Bind(wx.EVT_MENU, self.on_copy_html, html_item)
+		menu.AppendSeparator()
+		glossary_item = menu.Append(wx.ID_ANY, _("Glosarium dari berkas teks..."))
+		menu.Bind(wx.EVT_MENU, self.on_glossary_file, glossary_item)
+		prefetch_item = menu.AppendCheckItem(wx.ID_ANY, _("Muat awal kata terkait"))
+		prefetch_item.Check(self.config.is_prefetch_enabled())
+		menu.Bind(wx.EVT_MENU, self.on_toggle_prefetch, prefetch_item)
+		menu.AppendSeparator()
+		warm_item = menu.AppendCheckItem(wx.ID_ANY, _("Sembunyikan dialog saat ditutup"))
+		warm_item.Check(self.config.is_warm_dialog_enabled())
+		menu.Bind(wx.EVT_MENU, self.on_toggle_warm_dialog, warm_item)
+		keep_item = menu.AppendCheckItem(wx.ID_ANY, _("Pertahankan hasil terakhir"))
+		keep_item.Check(self.config.is_keep_last_result_enabled())
+		keep_item.Enable(self.config.is_warm_dialog_enabled())
+		menu.Bind(wx.EVT_MENU, self.on_toggle_keep_last_result, keep_item)
+		menu.AppendSeparator()
+		diagnostics_item = menu.Append(wx.ID_ANY, _("Diagnostik..."))
+		menu.Bind(wx.EVT_MENU, self.on_diagnostics, diagnostics_item)
+		self.PopupMenu(menu)
+		menu.Destroy()
+
+	def on_toggle_warm_dialog(self, event: wx.CommandEvent):
+		self.config.set_warm_dialog_enabled(not self.config.is_warm_dialog_enabled())
+
+	def on_toggle_keep_last_result(self, event: wx.CommandEvent):
+		self.config.set_keep_last_result_enabled(not self.config.is_keep_last_result_enabled())
+
+	def on_diagnostics(self, event: wx.CommandEvent):
+		DiagnosticsDialog(self).Show()
+
+	def on_glossary_file(self, event: wx.CommandEvent):
+		with wx.FileDialog(
+			self,
+			_("Pilih berkas teks"),
+			wildcard=_("Berkas teks") + " (*.txt)|*.txt",
+			style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+		) as file_dlg:
+			if file_dlg.ShowModal() != wx.ID_OK:
+				return
+			path = file_dlg.GetPath()
+		try:
+			with open(path, "r", encoding="utf-8", errors="replace") as f:
+				words = tokenize(f.read())
+		except OSError as e:
+			self._on_error(str(e))
+			return
+		self.show_glossary(words)
+
+	def show_glossary(self, words: list[str]):
+		if not words:
+			nvdaUI.message(_("Tidak ada kata yang ditemukan."))
+			return
+		GlossaryDialog(self, self.client, words, on_activate=self.load_from_history).Show()
+
+	def on_toggle_offline(self, event: wx.CommandEvent):
+		enabled = not self.config.is_offline_mode()
+		self.config.set_offline_mode(enabled)
+		self._reset_client()
+		if enabled:
+			nvdaUI.message(_("Kamus offline digunakan."))
+		else:
+			nvdaUI.message(_("Kamus online digunakan."))
+
+	def on_toggle_prefetch(self, event: wx.CommandEvent):
+		self.config.set_prefetch_enabled(not self.config.is_prefetch_enabled())
+		self._reset_client()
+		if self.prefetcher:
+			nvdaUI.message(_("Muat awal diaktifkan."))
+		else:
+			nvdaUI.message(_("Muat awal dinonaktifkan."))
+
+	def on_import_dump(self, event: wx.CommandEvent):
+		with wx.FileDialog(
+			self,
+			_("Pilih berkas kamus (JSON)"),
+			wildcard=_("Berkas JSON") + " (*.json;*.jsonl)|*.json;*.jsonl",
+			style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+		) as file_dlg:
+			if file_dlg.ShowModal() != wx.ID_OK:
+				return
+			dump_path = file_dlg.GetPath()
+		self.options_btn.Disable()
+		nvdaUI.message(_("Mengimpor kamus..."))
+		threading.Thread(target=self._import_worker, args=(dump_path,), daemon=True).start()
+
+	def _import_worker(self, dump_path: str):
+		try:
+			from .offline import OfflineStore
+
+			store = OfflineStore(self.config.offline_db_path)
+			try:
+				count = store.import_dump(dump_path)
+			finally:
+				store.close()
+			wx.CallAfter(self._on_import_done, count)
+		except Exception as e:
+			wx.CallAfter(self._on_error, str(e))
+			wx.CallAfter(self.options_btn.Enable)
+
+	def _on_import_done(self, count: int):
+		self.options_btn.Enable()
+		# Online clients fall back to the store too, so every client picks up the new entries.
+		self._reset_client()
+		nvdaUI.message(_("{count} entri diimpor.").format(count=count))
+
 	def load_from_history(self, query: str):
 		self.search_box.SetValue(query)
 		self.on_search_click(None)
@@ -282,22 +999,41 @@ class KBBIDialog(wx.Dialog):
 			nvdaUI.message(_("Ditandai."))
 			self.toggle_fav_btn.SetLabel(_("Hapus Tanda"))
 
-	def do_api_call(self, func: Callable[[], KBBIResult]):
+	def do_api_call(self, func: Callable[[], KBBIResult], key: str | None = None):
 		self.search_btn.Disable()
 		self.wotd_btn.Disable()
 		self.random_btn.Disable()
 		self.copy_btn.Disable()
 		self.toggle_fav_btn.Disable()
+		self._render_generation += 1
+		self._show_text_area()
 		self.result_area.SetValue(_("Memuat..."))
 
-		threading.Thread(target=self._worker, args=(func,), daemon=True).start()
-
-	def _worker(self, func: Callable[[], KBBIResult]):
-		try:
+		def lookup() -> KBBIResult:
 			result = func()
-			wx.CallAfter(self._on_success, result)
-		except Exception as e:
-			wx.CallAfter(self._on_error, str(e))
+			# Normalize every entry here on the lookup thread, so the UI thread only has
+			# to render the first entry before speech can start.
+			normalized(result)
+			return result
+
+		self.scheduler.submit(key, lookup, self._on_success, self._on_lookup_error)
+
+	def _on_lookup_error(self, exc: Exception):
+		suggestions = []
+		if isinstance(exc, EntryNotFoundError) and self.fuzzy:
+			suggestions = self.fuzzy.suggest(exc.query)
+		if not suggestions:
+			self._on_error(str(exc))
+			return
+		self._enable_controls()
+		self.result_area.SetValue(
+			str(exc) + "\n" + _("Mungkin maksud Anda:") + "\n" + "\n".join(suggestions),
+		)
+		self.suggest_list.Set(suggestions)
+		self.suggest_list.SetSelection(0)
+		self.suggest_list.SetFocus()
+		tones.beep(150, 100)
+		nvdaUI.message(_("Entri tidak ditemukan. Pilih saran."))
 
 	def _on_success(self, result: KBBIResult):
 		self._enable_controls()
@@ -305,15 +1041,16 @@ class KBBIDialog(wx.Dialog):
 
 		# Update config/state
 		self.config.add_history(result.lemma)
+		self.suggest_index.rank([result.lemma])
+		if self.prefetcher:
+			self.prefetcher.schedule(result)
 
 		# Update UI
-		text = self._format_result(result)
-		self.result_area.SetValue(text)
-		self.result_area.SetInsertionPoint(0)
-		self.result_area.ShowPosition(0)
+		self._show_result(result, result.timings)
+		log_lookup(result.lemma, result.timings)
 
 		# Set Focus to result for direct reading
-		self.result_area.SetFocus()
+		self._result_control().SetFocus()
 
 		if self.config.is_favorite(result.lemma):
 			self.toggle_fav_btn.SetLabel(_("Hapus Tanda"))
@@ -322,7 +1059,10 @@ class KBBIDialog(wx.Dialog):
 		self.toggle_fav_btn.Enable()
 		self.copy_btn.Enable()
 
-		nvdaUI.message(_("Selesai."))
+		if result.stale:
+			nvdaUI.message(_("Server tidak dapat dihubungi, menampilkan hasil tersimpan."))
+		else:
+			nvdaUI.message(_("Selesai."))
 
 	def _on_error(self, error_msg: str):
 		self._enable_controls()
@@ -336,66 +1076,3 @@ class KBBIDialog(wx.Dialog):
 		self.random_btn.Enable()
 		# Note: copy and fav are enabled only on success,
 		# but we re-enable search controls here so user can try again.
-
-	def _format_result(self, res: KBBIResult) -> str:
-		lines = []
-
-		for idx, entry in enumerate(res.entries, 1):
-			# Headword
-			head = unicodedata.normalize("NFKC", entry.entry)
-			if entry.pronunciation:
-				head += f"  /{entry.pronunciation}/"
-			lines.append(f"{head}")
-
-			if entry.baseWord:
-				lines.append(
-					f"  Kata Dasar: {unicodedata.normalize('NFKC', entry.baseWord)}",
-				)
-
-			# Definitions
-			if entry.definitions:
-				lines.append("  Definisi:")
-				for i, definition in enumerate(entry.definitions, 1):
-					labels = ", ".join([lbl.code for lbl in definition.labels])
-					label_part = f"[{labels}] " if labels else ""
-
-					def_text = unicodedata.normalize("NFKC", definition.definition)
-					lines.append(f"    {i}. {label_part}{def_text}")
-
-					if definition.usageExamples:
-						exs = "; ".join(
-							[unicodedata.normalize("NFKC", ex) for ex in definition.usageExamples],
-						)
-						lines.append(f"       Contoh: {exs}")
-
-			# Derived
-			if entry.derivedWords:
-				lines.append(
-					"  Kata Turunan: "
-					+ ", ".join(
-						[unicodedata.normalize("NFKC", w) for w in entry.derivedWords],
-					),
-				)
-
-			# Compound
-			if entry.compoundWords:
-				lines.append(
-					"  Gabungan Kata: "
-					+ ", ".join(
-						[unicodedata.normalize("NFKC", w) for w in entry.compoundWords],
-					),
-				)
-
-			# Proverbs
-			if entry.proverbs:
-				lines.append(
-					"  Peribahasa: "
-					+ ", ".join(
-						[unicodedata.normalize("NFKC", w) for w in entry.proverbs],
-					),
-				)
-
-			if idx < len(res.entries):
-				lines.append("")
-
-		return "\n".join(lines)
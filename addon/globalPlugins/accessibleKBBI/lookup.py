@@ -0,0 +1,126 @@
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from .backends import Backend, HedgedRouter, HTTPBackend
+from .batch import DEFAULT_CONCURRENCY, DEFAULT_RATE_LIMIT, BatchItem, RateLimiter
+from .client import KBBIClient
+from .config import ConfigManager
+from .resilience import CircuitBreaker, RetryPolicy
+
+# Where the command line interface keeps its configuration and cache when NVDA is not running.
+DATA_DIR_ENV = "ACCESSIBLEKBBI_DATA_DIR"
+
+
+class OfflineUnavailableError(RuntimeError):
+	"""Offline mode was requested explicitly, but the offline store cannot be used."""
+
+
+def create_client(config: ConfigManager, require_offline: bool = False) -> KBBIClient:
+	"""A client for the configured mode.
+
+	In offline mode a missing or unreadable offline store is logged and the online
+	dictionary is used instead, unless require_offline is set, which raises
+	OfflineUnavailableError.
+	"""
+	if config.is_offline_mode() or require_offline:
+		try:
+			return _offline_client(config.offline_db_path)
+		except Exception as e:
+			if require_offline:
+				raise OfflineUnavailableError(f"Kamus offline tidak dapat digunakan: {e}") from e
+			logging.warning(f"KBBI offline store unavailable, using the online dictionary: {e}")
+	backends: list[Backend] = [_http_backend(config, config.get_api_url())]
+	mirror_url = config.get_mirror_url()
+	if mirror_url:
+		backends.append(_http_backend(config, mirror_url))
+	if os.path.exists(config.offline_db_path):
+		# Imported entries answer when the servers fail or are slower than the hedge delay.
+		try:
+			from .offline import OfflineBackend, OfflineStore
+
+			backends.append(OfflineBackend(OfflineStore(config.offline_db_path)))
+		except Exception as e:
+			logging.warning(f"KBBI offline store could not be opened: {e}")
+	backend = backends[0]
+	if len(backends) > 1:
+		backend = HedgedRouter(backends, hedge_delay=config.get_hedge_delay())
+	return KBBIClient(cache=config.get_cache(), backend=backend)
+
+
+def _offline_client(path: str) -> KBBIClient:
+	# Opening a missing store would create an empty one.
+	if not os.path.exists(path):
+		raise FileNotFoundError(f"belum diimpor ({path})")
+	from .offline import OfflineKBBIClient, OfflineStore
+
+	return OfflineKBBIClient(OfflineStore(path))
+
+
+def _http_backend(config: ConfigManager, base_url: str) -> HTTPBackend:
+	return HTTPBackend(
+		base_url,
+		retry=RetryPolicy(**config.get_retry_settings()),
+		breaker=CircuitBreaker(**config.get_breaker_settings()),
+	)
+
+
+def headless_data_dir() -> str:
+	return os.environ.get(DATA_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".accessibleKBBI")
+
+
+def open_client(
+	data_dir: str | None = None,
+	offline: bool | None = None,
+	base_url: str | None = None,
+) -> KBBIClient:
+	"""A client configured from data_dir, for use without NVDA.
+
+	It shares the add-on's configuration format, lookup cache and offline store, so
+	pointing data_dir at the NVDA configuration's accessibleKBBI folder reuses them.
+	offline and base_url override the configuration for this client only; with
+	offline=True, OfflineUnavailableError is raised when the offline store is missing
+	or cannot be opened.
+	"""
+	config = ConfigManager(data_dir or headless_data_dir())
+	if offline is not None:
+		config.data["mode"] = "offline" if offline else "online"
+	if base_url:
+		config.data["api_url"] = base_url
+	return create_client(config, require_offline=bool(offline))
+
+
+def iter_lookup(
+	client: KBBIClient,
+	words: Iterable[str],
+	max_workers: int = DEFAULT_CONCURRENCY,
+	rate_limit: float = DEFAULT_RATE_LIMIT,
+) -> Iterator[BatchItem]:
+	"""Look words up concurrently, yielding results in input order as they become ready.
+
+	words is consumed lazily, so it can be a stream such as standard input; only a
+	few lookups beyond the oldest unfinished one are in flight at a time.
+	"""
+	limiter = RateLimiter(rate_limit)
+
+	def lookup(word: str) -> BatchItem:
+		cached = client.cache is not None and word in client.cache
+		if not cached:
+			limiter.wait()
+		start = time.perf_counter()
+		try:
+			result = client.search(word)
+		except Exception as e:
+			return BatchItem(word, error=str(e), elapsed=time.perf_counter() - start)
+		return BatchItem(word, result=result, elapsed=time.perf_counter() - start, cached=cached)
+
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="accessibleKBBI-lookup") as pool:
+		pending: deque[Future[BatchItem]] = deque()
+		for word in words:
+			pending.append(pool.submit(lookup, word))
+			if len(pending) >= 2 * max_workers:
+				yield pending.popleft().result()
+		while pending:
+			yield pending.popleft().result()
@@ -1,34 +1,183 @@
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Label:
 	code: str
 	name: str
 	kind: str
 
 
-@dataclass
+@lru_cache(maxsize=1024)
+def make_label(code: str, name: str, kind: str) -> Label:
+	# KBBI uses a small, fixed set of labels, so identical ones share one instance.
+	return Label(sys.intern(code), sys.intern(name), sys.intern(kind))
+
+
+@dataclass(frozen=True, slots=True)
 class Definition:
 	definition: str
 	referencedLemma: str = ""
-	labels: list[Label] = field(default_factory=list)
-	usageExamples: list[str] = field(default_factory=list)
+	labels: tuple[Label, ...] = ()
+	usageExamples: tuple[str, ...] = ()
+
+	@classmethod
+	def from_raw(cls, data: dict[str, Any]) -> "Definition":
+		return cls(
+			definition=data.get("definition", ""),
+			referencedLemma=data.get("referencedLemma", ""),
+			labels=tuple(
+				make_label(lbl.get("code", ""), lbl.get("name", ""), lbl.get("kind", ""))
+				for lbl in data.get("labels", [])
+			),
+			usageExamples=tuple(data.get("usageExamples", [])),
+		)
+
+	def to_raw(self) -> dict[str, Any]:
+		return {
+			"definition": self.definition,
+			"referencedLemma": self.referencedLemma,
+			"labels": [{"code": lbl.code, "name": lbl.name, "kind": lbl.kind} for lbl in self.labels],
+			"usageExamples": list(self.usageExamples),
+		}
+
+
+_WORD_LIST_FIELDS = ("derivedWords", "compoundWords", "metaphors", "proverbs")
 
 
-@dataclass
 class Entry:
-	entry: str
-	baseWord: str
-	pronunciation: str
-	definitions: list[Definition] = field(default_factory=list)
-	derivedWords: list[str] = field(default_factory=list)
-	compoundWords: list[str] = field(default_factory=list)
-	metaphors: list[str] = field(default_factory=list)
-	proverbs: list[str] = field(default_factory=list)
+	"""A dictionary entry whose definitions and word lists can be parsed on first access."""
+
+	__slots__ = (
+		"entry",
+		"baseWord",
+		"pronunciation",
+		"_raw",
+		"_definitions",
+		"_derivedWords",
+		"_compoundWords",
+		"_metaphors",
+		"_proverbs",
+	)
+
+	def __init__(
+		self,
+		entry: str,
+		baseWord: str,
+		pronunciation: str,
+		definitions: tuple[Definition, ...] = (),
+		derivedWords: tuple[str, ...] = (),
+		compoundWords: tuple[str, ...] = (),
+		metaphors: tuple[str, ...] = (),
+		proverbs: tuple[str, ...] = (),
+	):
+		super().__init__()
+		self.entry = entry
+		self.baseWord = baseWord
+		self.pronunciation = pronunciation
+		self._raw: dict[str, Any] | None = None
+		self._definitions: tuple[Definition, ...] | None = tuple(definitions)
+		self._derivedWords: tuple[str, ...] | None = tuple(derivedWords)
+		self._compoundWords: tuple[str, ...] | None = tuple(compoundWords)
+		self._metaphors: tuple[str, ...] | None = tuple(metaphors)
+		self._proverbs: tuple[str, ...] | None = tuple(proverbs)
+
+	@classmethod
+	def from_raw(cls, data: dict[str, Any], lazy: bool = False) -> "Entry":
+		obj = cls(data.get("entry", ""), data.get("baseWord", ""), data.get("pronunciation", ""))
+		obj._raw = data
+		obj._definitions = None
+		for name in _WORD_LIST_FIELDS:
+			setattr(obj, f"_{name}", None)
+		if not lazy:
+			obj.materialize()
+		return obj
+
+	def materialize(self):
+		"""Parse everything still pending and drop the raw response data."""
+		if self._raw is None:
+			return
+		if self._definitions is None:
+			self._definitions = self._parse_definitions()
+		for name in _WORD_LIST_FIELDS:
+			self._word_list(name)
+		self._raw = None
+
+	def to_raw(self) -> dict[str, Any]:
+		"""The entry in the shape of the API response it can be created from."""
+		raw: dict[str, Any] = {
+			"entry": self.entry,
+			"baseWord": self.baseWord,
+			"pronunciation": self.pronunciation,
+			"definitions": [d.to_raw() for d in self.definitions],
+		}
+		for name in _WORD_LIST_FIELDS:
+			raw[name] = list(self._word_list(name))
+		return raw
 
+	def _parse_definitions(self) -> tuple[Definition, ...]:
+		raw = self._raw or {}
+		return tuple(Definition.from_raw(d) for d in raw.get("definitions", []))
 
-@dataclass
+	def _release_raw(self):
+		# Once every field has been parsed, for example by rendering, the response data is
+		# no longer needed; keeping it would cost more memory than parsing eagerly.
+		if self._definitions is not None and all(
+			getattr(self, f"_{name}") is not None for name in _WORD_LIST_FIELDS
+		):
+			self._raw = None
+
+	@property
+	def definitions(self) -> tuple[Definition, ...]:
+		if self._definitions is None:
+			self._definitions = self._parse_definitions()
+			self._release_raw()
+		return self._definitions
+
+	def _word_list(self, name: str) -> tuple[str, ...]:
+		words = getattr(self, f"_{name}")
+		if words is None:
+			raw = self._raw or {}
+			words = tuple(w for w in raw.get(name, []) if w)
+			setattr(self, f"_{name}", words)
+			self._release_raw()
+		return words
+
+	@property
+	def derivedWords(self) -> tuple[str, ...]:
+		return self._word_list("derivedWords")
+
+	@property
+	def compoundWords(self) -> tuple[str, ...]:
+		return self._word_list("compoundWords")
+
+	@property
+	def metaphors(self) -> tuple[str, ...]:
+		return self._word_list("metaphors")
+
+	@property
+	def proverbs(self) -> tuple[str, ...]:
+		return self._word_list("proverbs")
+
+	def __repr__(self) -> str:
+		return (
+			f"Entry(entry={self.entry!r}, baseWord={self.baseWord!r}, pronunciation={self.pronunciation!r})"
+		)
+
+
+@dataclass(slots=True)
 class KBBIResult:
 	lemma: str
 	entries: list[Entry] = field(default_factory=list)
+	# NFKC-normalized copy filled in by the formatter on first render.
+	normalized: "KBBIResult | None" = field(default=None, repr=False, compare=False)
+	# Served from an expired cache entry because the server could not be reached.
+	stale: bool = field(default=False, compare=False)
+	# Seconds spent in each part of the lookup that produced it, see diagnostics.LOOKUP_SPANS.
+	timings: dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+
+	def to_raw(self) -> dict[str, Any]:
+		return {"lemma": self.lemma, "entries": [entry.to_raw() for entry in self.entries]}
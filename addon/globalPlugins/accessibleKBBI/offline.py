@@ -0,0 +1,160 @@
+import json
+import random
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterator
+from datetime import date
+from typing import Any
+from .cache import normalize_query
+from .backends import RANDOM, WOTD, Backend
+from .client import KBBIClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+	id INTEGER PRIMARY KEY,
+	key TEXT NOT NULL UNIQUE,
+	data BLOB NOT NULL
+)
+"""
+_CHUNK_SIZE = 64 * 1024
+
+
+def iter_dump(path: str) -> Iterator[dict[str, Any]]:
+	"""Yield entry objects from a JSON array or JSON Lines dump without reading it whole."""
+	decoder = json.JSONDecoder()
+	buf = ""
+	with open(path, "r", encoding="utf-8") as f:
+		while True:
+			chunk = f.read(_CHUNK_SIZE)
+			buf += chunk
+			pos = 0
+			while True:
+				# Skip separators between objects, including the enclosing array brackets.
+				while pos < len(buf) and buf[pos] in " \t\r\n,[]\ufeff":
+					pos += 1
+				if pos >= len(buf):
+					break
+				try:
+					obj, end = decoder.raw_decode(buf, pos)
+				except json.JSONDecodeError:
+					if not chunk:
+						raise
+					break
+				if isinstance(obj, dict):
+					yield obj
+				pos = end
+			buf = buf[pos:]
+			if not chunk:
+				return
+
+
+class OfflineStore:
+	"""Indexed SQLite store of KBBI entries in the same JSON shape as the API."""
+
+	def __init__(self, path: str):
+		super().__init__()
+		self.path = path
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(path, check_same_thread=False)
+		self._conn.execute(_SCHEMA)
+		self._conn.commit()
+
+	def close(self):
+		with self._lock:
+			self._conn.close()
+
+	def import_dump(self, dump_path: str, batch_size: int = 1000) -> int:
+		count = 0
+		batch: list[tuple[str, bytes]] = []
+		with self._lock:
+			for data in iter_dump(dump_path):
+				lemma = str(data.get("lemma", ""))
+				if not lemma or "entries" not in data:
+					continue
+				raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+				batch.append((normalize_query(lemma), zlib.compress(raw.encode("utf-8"))))
+				if len(batch) >= batch_size:
+					count += self._insert(batch)
+					batch = []
+			if batch:
+				count += self._insert(batch)
+		return count
+
+	def _insert(self, batch: list[tuple[str, bytes]]) -> int:
+		self._conn.executemany("INSERT OR REPLACE INTO entries (key, data) VALUES (?, ?)", batch)
+		self._conn.commit()
+		return len(batch)
+
+	def get(self, query: str) -> dict[str, Any] | None:
+		return self._query_one("SELECT data FROM entries WHERE key = ?", (normalize_query(query),))
+
+	def random(self) -> dict[str, Any] | None:
+		max_id = self._max_id()
+		if not max_id:
+			return None
+		return self._entry_from(random.randint(1, max_id))
+
+	def wotd(self, day: date | None = None) -> dict[str, Any] | None:
+		max_id = self._max_id()
+		if not max_id:
+			return None
+		day = day or date.today()
+		# Knuth multiplicative hash so consecutive days land far apart.
+		return self._entry_from((day.toordinal() * 2654435761) % max_id + 1)
+
+	def lemmas(self) -> list[str]:
+		with self._lock:
+			return [row[0] for row in self._conn.execute("SELECT key FROM entries ORDER BY key")]
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+	def _max_id(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT MAX(id) FROM entries").fetchone()[0] or 0
+
+	def _entry_from(self, row_id: int) -> dict[str, Any] | None:
+		# Row ids may have gaps after replaced entries; take the next existing row.
+		data = self._query_one("SELECT data FROM entries WHERE id >= ? ORDER BY id LIMIT 1", (row_id,))
+		if data is None:
+			data = self._query_one("SELECT data FROM entries ORDER BY id LIMIT 1", ())
+		return data
+
+	def _query_one(self, sql: str, params: tuple[Any, ...]) -> dict[str, Any] | None:
+		with self._lock:
+			row = self._conn.execute(sql, params).fetchone()
+		if row is None:
+			return None
+		return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+
+class OfflineBackend(Backend):
+	"""Entries imported into the local offline store.
+
+	A word missing from the store has no answer here rather than not existing, as
+	the store may hold only part of the dictionary.
+	"""
+
+	name = "offline"
+
+	def __init__(self, store: OfflineStore):
+		super().__init__()
+		self.store = store
+
+	def fetch(self, name: str) -> dict[str, Any] | None:
+		if name == WOTD:
+			return self.store.wotd()
+		if name == RANDOM:
+			return self.store.random()
+		return self.store.get(name)
+
+	def close(self):
+		self.store.close()
+
+
+class OfflineKBBIClient(KBBIClient):
+	def __init__(self, store: OfflineStore):
+		super().__init__(backend=OfflineBackend(store))
+		self.store = store
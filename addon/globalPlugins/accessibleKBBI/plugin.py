@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Accessible KBBI for NVDA
+# Copyright (C) 2026 Muhammad
+
+import threading
+import time
+import addonHandler
+import globalPluginHandler
+import scriptHandler
+import gui
+import wx
+import ui
+import inputCore
+from typing import TYPE_CHECKING
+from .diagnostics import record
+
+# The dialog, client and configuration modules are only imported on first use so
+# that loading the plugin at NVDA startup stays cheap.
+if TYPE_CHECKING:
+	from .client import KBBIClient
+	from .interface import KBBIDialog
+	from .selection import SelectionReader
+
+addonHandler.initTranslation()
+_ = wx.GetTranslation
+
+
+class GlobalPlugin(globalPluginHandler.GlobalPlugin):
+	def __init__(self):
+		super(GlobalPlugin, self).__init__()
+		self.dlg: "KBBIDialog | None" = None
+		self._quick_client: "KBBIClient | None" = None
+		self._quick_generation = 0
+		self._selection: "SelectionReader | None" = None
+
+	def terminate(self):
+		if self.dlg:
+			self.dlg.Destroy()
+			self.dlg = None
+		elif self._quick_client:
+			from .config import get_config
+
+			# Write lookups cached by quick speak or a glossary that are still waiting for the save timer.
+			get_config().flush()
+		if self._quick_client:
+			self._quick_client.backend.close()
+			self._quick_client = None
+		super(GlobalPlugin, self).terminate()
+
+	@scriptHandler.script(
+		description=_("Buka Accessible KBBI."),
+		gesture="kb:NVDA+alt+k",
+	)
+	def script_showSearchDialog(self, gesture: inputCore.InputGesture):
+		if self.dlg and self.dlg.IsShown():
+			self.dlg.Raise()
+			self.dlg.SetFocus()
+			ui.message(_("Dialog Accessible KBBI sudah terbuka."))
+			return
+
+		self._open_dialog()
+
+	@scriptHandler.script(
+		description=_("Cari teks terpilih di Accessible KBBI."),
+		gesture="kb:NVDA+shift+alt+k",
+	)
+	def script_searchSelection(self, gesture: inputCore.InputGesture):
+		if self.dlg and self.dlg.IsShown():
+			self.dlg.Raise()
+			self.dlg.SetFocus()
+			ui.message(_("Dialog Accessible KBBI sudah terbuka."))
+			return
+
+		text = self._get_selected_text()
+		if not text:
+			ui.message(_("Tidak ada teks yang dipilih."))
+			return
+
+		self._open_dialog().load_from_history(text)
+
+	@scriptHandler.script(
+		description=_(
+			"Ucapkan definisi pertama teks terpilih dari Accessible KBBI. Tekan dua kali untuk membuka dialog.",
+		),
+		gesture="kb:NVDA+control+alt+k",
+	)
+	def script_quickSpeak(self, gesture: inputCore.InputGesture):
+		text = self._get_selected_text()
+		if not text:
+			ui.message(_("Tidak ada teks yang dipilih."))
+			return
+		if scriptHandler.getLastScriptRepeatCount() > 0:
+			# The first press's lookup is usually cached by now, so the dialog shows it at once.
+			self._quick_generation += 1
+			self._open_dialog().load_from_history(text)
+			return
+		self._quick_generation += 1
+		threading.Thread(
+			target=self._quick_lookup,
+			args=(self._get_client(), text, self._quick_generation),
+			daemon=True,
+		).start()
+
+	def _quick_lookup(self, client: "KBBIClient", text: str, generation: int):
+		from .formatter import summary
+
+		try:
+			message = summary(client.search(text))
+		except Exception as e:
+			# Client errors carry a message meant for the user.
+			message = str(e)
+		wx.CallAfter(self._speak_quick_result, message, generation)
+
+	def _speak_quick_result(self, message: str, generation: int):
+		# Stay quiet if another press or the dialog has taken over since.
+		if generation == self._quick_generation:
+			ui.message(message)
+
+	def _get_client(self) -> "KBBIClient":
+		if self.dlg:
+			return self.dlg.client
+		if not self._quick_client:
+			from .config import get_config
+			from .lookup import create_client
+
+			self._quick_client = create_client(get_config())
+		return self._quick_client
+
+	@scriptHandler.script(
+		description=_("Buat glosarium dari teks terpilih di Accessible KBBI."),
+	)
+	def script_glossarySelection(self, gesture: inputCore.InputGesture):
+		text = self._get_selected_text(allow_word=False)
+		if not text:
+			ui.message(_("Tidak ada teks yang dipilih."))
+			return
+		from .batch import tokenize
+
+		words = tokenize(text)
+		if self.dlg and self.dlg.IsShown():
+			self.dlg.Raise()
+			self.dlg.show_glossary(words)
+			return
+		if not words:
+			ui.message(_("Tidak ada kata yang ditemukan."))
+			return
+		from .interface import GlossaryDialog
+
+		# Share the client quick lookups use, whose connections are closed and pending
+		# cache writes flushed when the plugin terminates.
+		GlossaryDialog(
+			gui.mainFrame,
+			self._get_client(),
+			words,
+			on_activate=lambda word: self._open_dialog().load_from_history(word),
+		).Show()
+
+	def _open_dialog(self) -> "KBBIDialog":
+		if self.dlg and not self.dlg.IsShown():
+			started = time.perf_counter()
+			self.dlg.reopen()
+			wx.CallAfter(lambda: record("dialog_reopen", time.perf_counter() - started))
+		elif not self.dlg:
+			started = time.perf_counter()
+			from .interface import KBBIDialog
+
+			self.dlg = KBBIDialog(gui.mainFrame)
+			self.dlg.Show()
+			self.dlg.Bind(wx.EVT_CLOSE, self._on_close)
+			# Runs once the events queued by showing the dialog have been handled.
+			wx.CallAfter(lambda: record("dialog_open", time.perf_counter() - started))
+		return self.dlg
+
+	def _get_selected_text(self, allow_word: bool = True) -> str | None:
+		if not self._selection:
+			from .selection import SelectionReader
+
+			self._selection = SelectionReader()
+		return self._selection.read(allow_word)
+
+	def _on_close(self, event: wx.CloseEvent):
+		if not self.dlg:
+			return
+		if event.CanVeto() and self.dlg.config.is_warm_dialog_enabled():
+			# Keep the dialog around hidden; reopening it is much cheaper than rebuilding it.
+			event.Veto()
+			self.dlg.hide_for_reuse()
+			return
+		wx.CallAfter(self.dlg.Destroy)
+		self.dlg = None
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+from .diagnostics import collect, record_prefetch
+from .cache import normalize_query
+from .client import KBBIClient
+from .models import KBBIResult
+
+DEFAULT_PREFETCH_COUNT = 5
+DEFAULT_PREFETCH_INTERVAL = 1.0
+
+
+class Prefetcher:
+	"""Warms the lookup cache with lemmas referenced by the last result.
+
+	Runs on a single low-priority thread, waits `interval` seconds between fetches and
+	pauses while `is_busy` reports a user-initiated lookup in progress.
+	"""
+
+	def __init__(
+		self,
+		client: KBBIClient,
+		max_items: int = DEFAULT_PREFETCH_COUNT,
+		interval: float = DEFAULT_PREFETCH_INTERVAL,
+		is_busy: Callable[[], bool] = lambda: False,
+	):
+		super().__init__()
+		self.client = client
+		self.max_items = max_items
+		self.interval = interval
+		self.is_busy = is_busy
+		self._queue: deque[str] = deque()
+		self._prefetched: set[str] = set()
+		self._used: set[str] = set()
+		self._stopped = False
+		self._cond = threading.Condition()
+		# Started with the first scheduled result, so opening the dialog does not pay for it.
+		self._thread: threading.Thread | None = None
+
+	def schedule(self, result: KBBIResult):
+		candidates: list[str] = []
+		seen = {normalize_query(result.lemma)}
+		for entry in result.entries:
+			words = [d.referencedLemma for d in entry.definitions]
+			words += entry.derivedWords + entry.compoundWords
+			for word in words:
+				key = normalize_query(word)
+				if not key or key in seen:
+					continue
+				seen.add(key)
+				if not self._is_cached(key):
+					candidates.append(key)
+		with self._cond:
+			if self._stopped:
+				return
+			# A newer result supersedes whatever was still queued for the previous one.
+			self._queue = deque(candidates[: self.max_items])
+			self._cond.notify()
+			if self._thread is None and self._queue:
+				self._thread = threading.Thread(target=self._run, name="accessibleKBBI-prefetch", daemon=True)
+				self._thread.start()
+
+	def clear(self):
+		with self._cond:
+			self._queue.clear()
+
+	def record_lookup(self, query: str):
+		key = normalize_query(query)
+		if key in self._prefetched and key not in self._used:
+			self._used.add(key)
+			record_prefetch(used=True)
+
+	def stats(self) -> dict[str, Any]:
+		prefetched = len(self._prefetched)
+		used = len(self._used)
+		return {
+			"prefetched": prefetched,
+			"used": used,
+			"hit_rate": used / prefetched if prefetched else 0.0,
+		}
+
+	def stop(self):
+		logging.debug(f"KBBI prefetch stats: {self.stats()}")
+		with self._cond:
+			self._stopped = True
+			self._queue.clear()
+			self._cond.notify()
+
+	def _is_cached(self, key: str) -> bool:
+		return self.client.cache is not None and key in self.client.cache
+
+	def _next(self) -> str | None:
+		with self._cond:
+			while not self._stopped and (not self._queue or self.is_busy()):
+				# Poll while busy so the queue resumes once the user's lookup is done.
+				self._cond.wait(timeout=self.interval if self._queue else None)
+			if self._stopped:
+				return None
+			return self._queue.popleft()
+
+	def _run(self):
+		while True:
+			key = self._next()
+			if key is None:
+				return
+			if self._is_cached(key):
+				continue
+			try:
+				# Fetch past the cache lookup and out of the timing histograms, so that
+				# background work does not count as the user's cache misses or latency.
+				# Nothing reads the result, so it is only parsed lazily.
+				with collect(record=False):
+					self.client.fetch_remote(key, lazy=True)
+				self._prefetched.add(key)
+				record_prefetch(used=False)
+			except Exception as e:
+				logging.debug(f"KBBI prefetch of {key!r} failed: {e}")
+			time.sleep(self.interval)
@@ -0,0 +1,91 @@
+import logging
+import random
+import threading
+import time
+
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.25
+DEFAULT_RETRY_MAX_DELAY = 2.0
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+
+class CircuitOpenError(ConnectionError):
+	def __init__(self):
+		super().__init__("Server sedang tidak dapat dihubungi. Coba lagi nanti.")
+
+
+class RetryPolicy:
+	"""How often a failed idempotent request is retried, with jittered exponential backoff."""
+
+	def __init__(
+		self,
+		attempts: int = DEFAULT_RETRY_ATTEMPTS,
+		base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+		max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+	):
+		super().__init__()
+		self.attempts = max(1, attempts)
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+
+	def delay(self, attempt: int) -> float:
+		"""Seconds to wait before retrying after the given failed attempt (1-based)."""
+		# Full jitter keeps clients that failed together from retrying together.
+		return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+	"""Fails fast for a cool-down period after consecutive failures.
+
+	Once the cool-down has passed a single request is let through as a probe; its
+	outcome closes the breaker again or restarts the cool-down.
+	"""
+
+	def __init__(
+		self,
+		threshold: int = DEFAULT_BREAKER_THRESHOLD,
+		cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+	):
+		super().__init__()
+		self.threshold = threshold
+		self.cooldown = cooldown
+		self._failures = 0
+		self._opened_at: float | None = None
+		self._probing = False
+		self._lock = threading.Lock()
+
+	@property
+	def is_open(self) -> bool:
+		with self._lock:
+			return self._opened_at is not None and (
+				self._probing or time.monotonic() - self._opened_at < self.cooldown
+			)
+
+	def allow(self) -> bool:
+		with self._lock:
+			if self._opened_at is None:
+				return True
+			if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+				return False
+			self._probing = True
+			return True
+
+	def record_success(self):
+		with self._lock:
+			if self._opened_at is not None:
+				logging.info("KBBI API reachable again, circuit closed")
+			self._failures = 0
+			self._opened_at = None
+			self._probing = False
+
+	def record_failure(self):
+		with self._lock:
+			self._failures += 1
+			if self._probing or self._failures >= self.threshold:
+				if not self._probing:
+					logging.warning(
+						f"KBBI API failed {self._failures} times, failing fast for {self.cooldown}s",
+					)
+				self._opened_at = time.monotonic()
+				self._probing = False
@@ -0,0 +1,94 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+
+class LookupScheduler:
+	"""Runs lookups on a small worker pool and delivers only the newest result.
+
+	Every submission starts a new generation. Identical in-flight lookups share one
+	future, lookups that have not started yet are cancelled when a newer one arrives,
+	and results of older generations are dropped instead of reaching the UI.
+	"""
+
+	def __init__(self, dispatch: Callable[..., Any], max_workers: int = 2):
+		super().__init__()
+		self._dispatch = dispatch
+		self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="accessibleKBBI")
+		self._inflight: dict[str, Future[Any]] = {}
+		self._pending: set[Future[Any]] = set()
+		self._generation = 0
+		self._closed = False
+		# Reentrant: add_done_callback runs the callback inline if the future already finished.
+		self._lock = threading.RLock()
+
+	def submit(
+		self,
+		key: str | None,
+		func: Callable[[], Any],
+		on_success: Callable[[Any], None],
+		on_error: Callable[[Exception], None],
+	) -> int:
+		with self._lock:
+			if self._closed:
+				return self._generation
+			self._generation += 1
+			generation = self._generation
+			future = self._inflight.get(key) if key else None
+			if future is None:
+				future = self._executor.submit(func)
+				self._pending.add(future)
+				if key:
+					self._inflight[key] = future
+				future.add_done_callback(lambda f: self._forget(key, f))
+			stale = [f for f in self._pending if f is not future]
+		for f in stale:
+			f.cancel()
+		future.add_done_callback(lambda f: self._deliver(f, generation, on_success, on_error))
+		return generation
+
+	def is_current(self, generation: int) -> bool:
+		return not self._closed and generation == self._generation
+
+	def is_busy(self) -> bool:
+		return bool(self._pending)
+
+	def cancel(self):
+		with self._lock:
+			self._generation += 1
+			pending = list(self._pending)
+		for f in pending:
+			f.cancel()
+
+	def shutdown(self):
+		with self._lock:
+			self._closed = True
+			self._generation += 1
+		self._executor.shutdown(wait=False, cancel_futures=True)
+
+	def _forget(self, key: str | None, future: Future[Any]):
+		with self._lock:
+			self._pending.discard(future)
+			if key and self._inflight.get(key) is future:
+				del self._inflight[key]
+
+	def _deliver(
+		self,
+		future: Future[Any],
+		generation: int,
+		on_success: Callable[[Any], None],
+		on_error: Callable[[Exception], None],
+	):
+		if future.cancelled() or not self.is_current(generation):
+			return
+		exc = future.exception()
+		if exc is not None:
+			self._dispatch(self._call_if_current, generation, on_error, exc)
+		else:
+			self._dispatch(self._call_if_current, generation, on_success, future.result())
+
+	def _call_if_current(self, generation: int, callback: Callable[[Any], None], value: Any):
+		# Checked again on the dispatching thread, as a newer lookup may have started meanwhile.
+		if self.is_current(generation):
+			callback(value)
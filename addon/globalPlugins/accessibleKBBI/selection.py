@@ -0,0 +1,103 @@
+import string
+import time
+from collections.abc import Callable
+import api
+import textInfos
+from .diagnostics import record
+from .batch import tokenize
+
+# Quotes, dashes and ellipses commonly found around words in documents.
+_STRIP_CHARS = string.whitespace + string.punctuation + "“”‘’«»…–—"
+
+
+def clean_query(text: str, single_word: bool = False) -> str:
+	"""Collapse whitespace and trim surrounding punctuation; optionally keep only the first word."""
+	text = " ".join(text.split()).strip(_STRIP_CHARS)
+	if single_word:
+		words = tokenize(text, min_length=1)
+		return words[0] if words else ""
+	return text
+
+
+def _tree_interceptor_selection(obj) -> str | None:
+	# Browse mode documents (e.g. web pages) keep their own selection.
+	interceptor = getattr(obj, "treeInterceptor", None)
+	if not interceptor:
+		return None
+	return interceptor.makeTextInfo(textInfos.POSITION_SELECTION).text
+
+
+def _object_selection(obj) -> str | None:
+	# Covers editable text, terminals and most documents such as Word or Notepad.
+	return obj.makeTextInfo(textInfos.POSITION_SELECTION).text
+
+
+def _caret_word(obj) -> str | None:
+	info = (getattr(obj, "treeInterceptor", None) or obj).makeTextInfo(textInfos.POSITION_CARET)
+	info.expand(textInfos.UNIT_WORD)
+	return info.text
+
+
+def _review_word(obj) -> str | None:
+	info = api.getReviewPosition().copy()
+	info.expand(textInfos.UNIT_WORD)
+	return info.text
+
+
+Strategy = Callable[[object], "str | None"]
+
+_SELECTION_STRATEGIES: dict[str, Strategy] = {
+	"tree_interceptor": _tree_interceptor_selection,
+	"object": _object_selection,
+}
+_WORD_STRATEGIES: dict[str, Strategy] = {
+	"caret_word": _caret_word,
+	"review_word": _review_word,
+}
+
+
+class SelectionReader:
+	"""Reads the text to look up, remembering per application and control class which
+	way of getting the selection worked last time so it is tried first.
+	"""
+
+	def __init__(self):
+		super().__init__()
+		self._strategies: dict[tuple[str, str], str] = {}
+
+	def read(self, allow_word: bool = True) -> str | None:
+		"""The selected text or, without a selection, the word at the caret or review cursor."""
+		obj = api.getFocusObject()
+		if not obj:
+			return None
+		app_name = getattr(getattr(obj, "appModule", None), "appName", "")
+		key = (app_name, type(obj).__name__)
+		names = list(_SELECTION_STRATEGIES)
+		known = self._strategies.get(key)
+		if known:
+			names.remove(known)
+			names.insert(0, known)
+		for name in names:
+			text = self._try(name, _SELECTION_STRATEGIES[name], obj)
+			if text:
+				self._strategies[key] = name
+				return clean_query(text) or None
+		if allow_word:
+			for name, strategy in _WORD_STRATEGIES.items():
+				text = self._try(name, strategy, obj)
+				word = clean_query(text, single_word=True) if text else ""
+				if word:
+					return word
+		return None
+
+	@staticmethod
+	def _try(name: str, strategy: Strategy, obj) -> str | None:
+		started = time.perf_counter()
+		try:
+			text = strategy(obj)
+		except Exception:
+			text = None
+		record(f"selection_{name}", time.perf_counter() - started)
+		if not text or text.isspace():
+			return None
+		return text
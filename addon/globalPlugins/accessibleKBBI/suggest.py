@@ -0,0 +1,63 @@
+import bisect
+from collections.abc import Iterable
+from .cache import normalize_query
+
+
+class PrefixIndex:
+	"""Sorted word list answering prefix queries with bisect.
+
+	Words added with a rank (history, favorites) are listed before plain dictionary words.
+	"""
+
+	def __init__(self, words: Iterable[str] = ()):
+		super().__init__()
+		self._words: list[str] = sorted({normalize_query(w) for w in words if w})
+		self._ranks: dict[str, int] = {}
+		self._top_rank = 0
+
+	def add(self, words: Iterable[str]):
+		new_words = [w for w in {normalize_query(w) for w in words if w} if w not in self]
+		if len(new_words) > 32:
+			self._words = sorted(self._words + new_words)
+		else:
+			for word in new_words:
+				bisect.insort(self._words, word)
+
+	def rank(self, words: Iterable[str]):
+		"""Put the words, most important first, ahead of every completion ranked so far."""
+		words = list(dict.fromkeys(normalize_query(w) for w in words if w))
+		self.add(words)
+		self._top_rank -= len(words)
+		for position, word in enumerate(words, self._top_rank):
+			self._ranks[word] = position
+
+	@property
+	def words(self) -> list[str]:
+		return self._words
+
+	def ranked_words(self) -> list[str]:
+		return sorted(self._ranks, key=self._ranks.__getitem__)
+
+	def complete(self, prefix: str, limit: int = 10) -> list[str]:
+		prefix = normalize_query(prefix)
+		if not prefix:
+			return []
+		start = bisect.bisect_left(self._words, prefix)
+		# Every word sharing the prefix sorts before prefix + the highest code point.
+		end = bisect.bisect_left(self._words, prefix + "\U0010ffff", start)
+		ranked = sorted((rank, w) for w, rank in self._ranks.items() if w.startswith(prefix))
+		results = [w for _rank, w in ranked[:limit]]
+		for i in range(start, end):
+			if len(results) >= limit:
+				break
+			word = self._words[i]
+			if word not in self._ranks:
+				results.append(word)
+		return results
+
+	def __contains__(self, word: str) -> bool:
+		i = bisect.bisect_left(self._words, word)
+		return i < len(self._words) and self._words[i] == word
+
+	def __len__(self) -> int:
+		return len(self._words)
@@ -1,8 +1,38 @@
+import logging
+import os
+import shutil
+import globalVars
 import gui
 import wx
 
+ADDON_NAME = "accessibleKBBI"
+# Data files that versions up to 1.0 kept inside the add-on's plugin folder.
+LEGACY_DATA_FILES = ("accessibleKBBI.json", "accessibleKBBI-cache.json", "accessibleKBBI-offline.db")
+
+
+def _migrate_legacy_data():
+	"""Copy data files out of the installed version before NVDA deletes it for the update.
+
+	NVDA removes the old add-on folder before loading the new version, so this has to
+	happen here, while the old folder still exists.
+	"""
+	config_path = globalVars.appArgs.configPath
+	legacy_dir = os.path.join(config_path, "addons", ADDON_NAME, "globalPlugins", ADDON_NAME)
+	data_dir = os.path.join(config_path, ADDON_NAME)
+	for name in LEGACY_DATA_FILES:
+		legacy_path = os.path.join(legacy_dir, name)
+		new_path = os.path.join(data_dir, name)
+		if not os.path.exists(legacy_path) or os.path.exists(new_path):
+			continue
+		try:
+			os.makedirs(data_dir, exist_ok=True)
+			shutil.copy2(legacy_path, new_path)
+		except OSError as e:
+			logging.warning(f"KBBI could not migrate {legacy_path}: {e}")
+
 
 def onInstall():
+	_migrate_legacy_data()
 	gui.messageBox(
 		"Terima kasih telah menginstal Accessible KBBI! Semoga add-on ini membantu Anda belajar dan bekerja lebih produktif. Salam hangat dari Muhammad!",
 		"Accessible KBBI",
@@ -0,0 +1,170 @@
+"""A local stand-in for the KBBI API that replays recorded responses.
+
+Every JSON file in the fixtures folder is served as /api/v1/entry/<file name>;
+other words get a 404 like the real API. Latency, jitter and an error rate can
+be set so client behaviour can be measured under slow or failing servers.
+
+	python benchmarks/mock_server.py --port 8555 --latency 0.08 --jitter 0.04 --error-rate 0.05
+"""
+
+import argparse
+import gzip
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib import parse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+API_PREFIX = "/api/v1/entry/"
+
+
+def load_fixtures(directory: str | Path = FIXTURES_DIR) -> dict[str, bytes]:
+	"""Recorded responses by entry name, as the JSON bytes to send."""
+	fixtures: dict[str, bytes] = {}
+	for path in sorted(Path(directory).glob("*.json")):
+		data = json.loads(path.read_text(encoding="utf-8"))
+		fixtures[path.stem] = json.dumps(data, ensure_ascii=False).encode("utf-8")
+	return fixtures
+
+
+class MockKBBIServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def __init__(
+		self,
+		fixtures: dict[str, bytes],
+		port: int = 0,
+		latency: float = 0.0,
+		jitter: float = 0.0,
+		error_rate: float = 0.0,
+		seed: int | None = None,
+	):
+		super().__init__(("127.0.0.1", port), _Handler)
+		self.fixtures = fixtures
+		self.latency = latency
+		self.jitter = jitter
+		self.error_rate = error_rate
+		# Requests still to be answered with 503 regardless of the error rate, for tests.
+		self.fail_next = 0
+		self.requests = 0
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+		self._thread: threading.Thread | None = None
+		self._connections: set[socket.socket] = set()
+
+	@property
+	def base_url(self) -> str:
+		return f"http://127.0.0.1:{self.server_address[1]}/api/v1"
+
+	def start(self) -> "MockKBBIServer":
+		self._thread = threading.Thread(target=self.serve_forever, name="mock-kbbi", daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self):
+		self.shutdown()
+		self.server_close()
+		# Kept-alive connections would otherwise go on being served.
+		with self._lock:
+			connections = list(self._connections)
+		for conn in connections:
+			try:
+				conn.shutdown(socket.SHUT_RDWR)
+			except OSError:
+				pass
+
+	def process_request(self, request: socket.socket | tuple[bytes, socket.socket], client_address: Any):
+		if isinstance(request, socket.socket):
+			with self._lock:
+				self._connections.add(request)
+		super().process_request(request, client_address)
+
+	def shutdown_request(self, request: socket.socket | tuple[bytes, socket.socket]):
+		if isinstance(request, socket.socket):
+			with self._lock:
+				self._connections.discard(request)
+		super().shutdown_request(request)
+
+	def plan_response(self) -> tuple[float, bool]:
+		"""The delay before answering and whether this request fails."""
+		with self._lock:
+			self.requests += 1
+			delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+			failed = self._random.random() < self.error_rate
+			if self.fail_next > 0:
+				self.fail_next -= 1
+				failed = True
+		return max(0.0, delay), failed
+
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	# Send headers and body in one write; separate small writes stall on delayed ACKs.
+	wbufsize = -1
+	server: MockKBBIServer
+
+	def do_GET(self):
+		delay, failed = self.server.plan_response()
+		if delay:
+			time.sleep(delay)
+		path = parse.urlsplit(self.path).path
+		name = parse.unquote(path[len(API_PREFIX) :]) if path.startswith(API_PREFIX) else None
+		if failed:
+			self._send(503, b'{"error":"service unavailable"}')
+		elif name is not None and name in self.server.fixtures:
+			self._send(200, self.server.fixtures[name])
+		else:
+			self._send(404, b'{"error":"not found"}')
+
+	def _send(self, status: int, body: bytes):
+		gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+		if gzipped:
+			body = gzip.compress(body, mtime=0)
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		if gzipped:
+			self.send_header("Content-Encoding", "gzip")
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format: str, *args):
+		pass
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Mock KBBI API replaying recorded responses.")
+	parser.add_argument("--port", type=int, default=8555)
+	parser.add_argument("--fixtures", default=str(FIXTURES_DIR))
+	parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response.")
+	parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds added to the latency.")
+	parser.add_argument(
+		"--error-rate",
+		type=float,
+		default=0.0,
+		help="Fraction of requests answered with 503.",
+	)
+	args = parser.parse_args()
+	server = MockKBBIServer(
+		load_fixtures(args.fixtures),
+		port=args.port,
+		latency=args.latency,
+		jitter=args.jitter,
+		error_rate=args.error_rate,
+	)
+	print(f"Serving {len(server.fixtures)} entries at {server.base_url}")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+
+if __name__ == "__main__":
+	main()
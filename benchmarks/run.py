@@ -0,0 +1,404 @@
+"""Benchmarks for the add-on's lookup path, runnable without NVDA.
+
+Results are written as JSON so runs from different commits can be compared:
+
+	python benchmarks/run.py --output before.json
+	python benchmarks/run.py --compare before.json
+
+Metrics ending in _ms are times and those ending in _kb memory (lower is better);
+those ending in _per_s are throughputs (higher is better). Each benchmark runs --repeat times and
+reports the median of every metric along with the range it fell in. --compare exits with 1 when
+any of them is worse than the baseline by more than the threshold even between the best current run
+and the worst baseline one, so that run-to-run noise alone is not reported as a regression.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from mock_server import MockKBBIServer, load_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "addon" / "globalPlugins"))
+
+from accessibleKBBI import formatter  # noqa: E402
+from accessibleKBBI.backends import USER_AGENT, HTTPBackend  # noqa: E402
+from accessibleKBBI.cache import LookupCache  # noqa: E402
+from accessibleKBBI.client import KBBIClient  # noqa: E402
+from accessibleKBBI.config import MAX_HISTORY, ConfigManager  # noqa: E402
+from accessibleKBBI.resilience import CircuitBreaker, RetryPolicy  # noqa: E402
+
+RESULTS_VERSION = 2
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 5
+# Suffixes of the metrics that are compared; the others describe the run.
+LOWER_IS_BETTER = ("_ms", "_kb")
+HIGHER_IS_BETTER = ("_per_s",)
+# The slowest of a few hundred requests says more about the machine than about the code.
+NOT_COMPARED = ("max_ms",)
+FORMATS = (
+	formatter.FORMAT_TEXT,
+	formatter.FORMAT_DEFINITIONS,
+	formatter.FORMAT_MARKDOWN,
+	formatter.FORMAT_HTML,
+)
+# History updates timed together by the config benchmark.
+HISTORY_UPDATES = 10_000
+# An entry much longer than the recorded ones, as for words with many senses.
+LARGE_ENTRY = "_large"
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+	ordered = sorted(samples)
+
+	def at(p: float) -> float:
+		return round(ordered[int(p * (len(ordered) - 1))] * 1000, 3)
+
+	return {
+		"mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+		"p50_ms": at(0.5),
+		"p90_ms": at(0.9),
+		"p95_ms": at(0.95),
+		"p99_ms": at(0.99),
+		"max_ms": round(ordered[-1] * 1000, 3),
+	}
+
+
+def _time_per_call(func: Callable[[], Any], rounds: int = 5, min_time: float = 0.2) -> float:
+	"""Median seconds per call over several rounds, each running for at least min_time."""
+	calls = 1
+	while True:
+		start = time.perf_counter()
+		for _ in range(calls):
+			func()
+		elapsed = time.perf_counter() - start
+		if elapsed >= min_time / rounds:
+			break
+		calls *= 2
+	times = [elapsed / calls]
+	for _ in range(rounds - 1):
+		start = time.perf_counter()
+		for _ in range(calls):
+			func()
+		times.append((time.perf_counter() - start) / calls)
+	return statistics.median(times)
+
+
+def _large_entry(fixtures: dict[str, bytes], copies: int = 40) -> bytes:
+	entries = [entry for raw in fixtures.values() for entry in json.loads(raw)["entries"]]
+	return json.dumps({"lemma": "besar", "entries": entries * copies}, ensure_ascii=False).encode("utf-8")
+
+
+def bench_search(fixtures: dict[str, bytes], args: argparse.Namespace) -> dict[str, Any]:
+	server = MockKBBIServer(
+		fixtures,
+		latency=args.latency,
+		jitter=args.jitter,
+		error_rate=args.error_rate,
+		seed=args.seed,
+	).start()
+	words = [name for name in fixtures if name != LARGE_ENTRY]
+	client = KBBIClient(
+		server.base_url,
+		retry=RetryPolicy(base_delay=0.01, max_delay=0.05),
+		# The breaker would turn a run with errors into a run of instant failures.
+		breaker=CircuitBreaker(threshold=args.requests + 1),
+	)
+	samples: list[float] = []
+	errors = 0
+	try:
+		for i in range(args.requests):
+			start = time.perf_counter()
+			try:
+				client.search(words[i % len(words)])
+			except ConnectionError:
+				errors += 1
+			samples.append(time.perf_counter() - start)
+		cached = KBBIClient(server.base_url, cache=LookupCache(None))
+		for word in words:
+			cached.search(word)
+
+		def search_cached():
+			cached.search(words[0])
+
+		cached_time = _time_per_call(search_cached)
+		requests = server.requests
+	finally:
+		client.backend.close()
+		server.stop()
+	return {
+		**_percentiles(samples),
+		"cached_ms": round(cached_time * 1000, 4),
+		"requests": args.requests,
+		"server_requests": requests,
+		"errors": errors,
+	}
+
+
+def bench_transport(fixtures: dict[str, bytes], args: argparse.Namespace) -> dict[str, Any]:
+	"""Per-request latency of the pooled keep-alive connections against a new urlopen per request.
+
+	The server answers at once, so the numbers are the client's own overhead.
+	"""
+	server = MockKBBIServer(fixtures).start()
+	backend = HTTPBackend(server.base_url)
+	url = f"{backend.base_url}/entry/rumah"
+	headers = {"User-Agent": USER_AGENT}
+	results: dict[str, Any] = {}
+	try:
+		getters: tuple[tuple[str, Callable[[str, dict[str, str]], tuple[int, bytes]]], ...] = (
+			("pooled", backend.pool.get),
+			("urlopen", backend.get_urllib),
+		)
+		for name, get in getters:
+			get(url, headers)
+			samples: list[float] = []
+			for _ in range(args.requests):
+				start = time.perf_counter()
+				status, _body = get(url, headers)
+				samples.append(time.perf_counter() - start)
+				assert status == 200
+			results.update({f"{name}_{key}": value for key, value in _percentiles(samples).items()})
+	finally:
+		backend.close()
+		server.stop()
+	return results
+
+
+def bench_parse(fixtures: dict[str, bytes]) -> dict[str, Any]:
+	client = KBBIClient()
+	results: dict[str, Any] = {}
+	for name, raw in (("small", fixtures["rumah"]), ("large", fixtures[LARGE_ENTRY])):
+		data = json.loads(raw)
+		for lazy in (True, False):
+			mode = "lazy" if lazy else "eager"
+			per_call = _time_per_call(partial(client.parse_response, data, lazy=lazy))
+			results[f"{name}_{mode}_per_s"] = round(1 / per_call, 1)
+		results[f"{name}_json_per_s"] = round(1 / _time_per_call(partial(json.loads, raw)), 1)
+	return results
+
+
+def bench_memory(fixtures: dict[str, bytes], copies: int = 100) -> dict[str, Any]:
+	"""Memory kept by parsed results, lazy and eager, before and after rendering them.
+
+	Lazy entries keep their part of the decoded response until every field is read,
+	so the response is decoded while tracing too.
+	"""
+	client = KBBIClient()
+	raws = [raw for name, raw in fixtures.items() if name != LARGE_ENTRY] * copies
+	results: dict[str, Any] = {}
+	for stage in ("parse", "render"):
+		for lazy in (True, False):
+			gc.collect()
+			tracemalloc.start()
+			parsed = [client.parse_response(json.loads(raw), lazy=lazy) for raw in raws]
+			if stage == "render":
+				for res in parsed:
+					formatter.render(res)
+			gc.collect()
+			kept, _peak = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+			del parsed
+			mode = "lazy" if lazy else "eager"
+			results[f"{stage}_{mode}_kb"] = round(kept / 1024, 1)
+	return results
+
+
+def bench_format(fixtures: dict[str, bytes]) -> dict[str, Any]:
+	client = KBBIClient()
+	results: dict[str, Any] = {}
+	for name, raw in (("small", fixtures["jalan"]), ("large", fixtures[LARGE_ENTRY])):
+		res = client.parse_response(json.loads(raw))
+		for fmt in FORMATS:
+			per_call = _time_per_call(partial(formatter.render, res, fmt))
+			results[f"{name}_{fmt}_ms"] = round(per_call * 1000, 4)
+		results[f"{name}_summary_ms"] = round(_time_per_call(partial(formatter.summary, res)) * 1000, 4)
+	return results
+
+
+def bench_config() -> dict[str, Any]:
+	with tempfile.TemporaryDirectory() as data_dir:
+		config = ConfigManager(data_dir)
+		for i in range(50):
+			config.add_history(f"kata{i}")
+			config.add_favorite(f"favorit{i}")
+		config.flush()
+
+		def add_history():
+			config.add_history("rumah")
+
+		# More distinct words than the history keeps, so most updates also evict one.
+		words = [f"kata{i % (2 * MAX_HISTORY)}" for i in range(HISTORY_UPDATES)]
+
+		def update_history():
+			for word in words:
+				config.add_history(word)
+
+		def flush():
+			config.save()
+			config.flush()
+
+		results = {
+			"add_history_ms": round(_time_per_call(add_history) * 1000, 4),
+			"history_10k_ms": round(_time_per_call(update_history) * 1000, 3),
+			"flush_ms": round(_time_per_call(flush) * 1000, 4),
+			"file_bytes": os.path.getsize(config.config_path),
+		}
+		config.flush()
+	return results
+
+
+def _git_commit() -> str:
+	try:
+		return subprocess.run(
+			["git", "rev-parse", "--short", "HEAD"],
+			cwd=ROOT,
+			capture_output=True,
+			text=True,
+			check=True,
+		).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return ""
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+	fixtures = load_fixtures()
+	fixtures[LARGE_ENTRY] = _large_entry(fixtures)
+	benchmarks: dict[str, Callable[[], dict[str, Any]]] = {
+		"search": partial(bench_search, fixtures, args),
+		"transport": partial(bench_transport, fixtures, args),
+		"parse": partial(bench_parse, fixtures),
+		"format": partial(bench_format, fixtures),
+		"memory": partial(bench_memory, fixtures),
+		"config": bench_config,
+	}
+	selected = args.only or list(benchmarks)
+	# Repeating the whole selection, rather than each benchmark in turn, spreads a burst
+	# of load on the machine over the runs of several benchmarks.
+	runs: dict[str, list[dict[str, Any]]] = {name: [] for name in selected}
+	for _ in range(args.repeat):
+		for name in selected:
+			runs[name].append(benchmarks[name]())
+	results: dict[str, dict[str, Any]] = {}
+	ranges: dict[str, dict[str, list[float]]] = {}
+	for name in selected:
+		results[name], ranges[name] = _summarize(runs[name])
+	return {
+		"version": RESULTS_VERSION,
+		"commit": _git_commit(),
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"timestamp": int(time.time()),
+		"settings": {
+			"requests": args.requests,
+			"latency": args.latency,
+			"jitter": args.jitter,
+			"error_rate": args.error_rate,
+			"repeat": args.repeat,
+		},
+		"results": results,
+		"ranges": ranges,
+	}
+
+
+def _summarize(runs: list[dict[str, Any]]) -> tuple[dict[str, Any], dict[str, list[float]]]:
+	"""The median of each compared metric over the runs, and the lowest and highest values."""
+	results = dict(runs[0])
+	ranges: dict[str, list[float]] = {}
+	for metric in results:
+		if not metric.endswith(LOWER_IS_BETTER + HIGHER_IS_BETTER):
+			continue
+		values = [run[metric] for run in runs]
+		results[metric] = round(statistics.median(values), 4)
+		ranges[metric] = [min(values), max(values)]
+	return results, ranges
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+	"""Descriptions of the metrics that got worse than the baseline by more than threshold.
+
+	The best current run is compared with the worst baseline run, so a metric whose ranges
+	overlap is never reported. Results of single runs have no ranges and compare by value.
+	"""
+	regressions: list[str] = []
+	for group, metrics in current["results"].items():
+		for metric, value in metrics.items():
+			old = baseline.get("results", {}).get(group, {}).get(metric)
+			if not old or not isinstance(value, (int, float)) or metric.endswith(NOT_COMPARED):
+				continue
+			low, high = current.get("ranges", {}).get(group, {}).get(metric, (value, value))
+			old_low, old_high = baseline.get("ranges", {}).get(group, {}).get(metric, (old, old))
+			if metric.endswith(LOWER_IS_BETTER):
+				change = low / old_high - 1
+			elif metric.endswith(HIGHER_IS_BETTER):
+				change = old_low / high - 1 if high else float("inf")
+			else:
+				continue
+			if change > threshold:
+				regressions.append(f"{group}.{metric}: {old} -> {value} ({change:+.0%} between the ranges)")
+	return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Benchmark the KBBI client against a local mock API.")
+	parser.add_argument(
+		"--only",
+		nargs="+",
+		choices=("search", "transport", "parse", "format", "memory", "config"),
+	)
+	parser.add_argument("--requests", type=int, default=200, help="Searches sent to the mock server.")
+	parser.add_argument("--latency", type=float, default=0.02, help="Mock server latency in seconds.")
+	parser.add_argument("--jitter", type=float, default=0.01, help="Mock server latency jitter in seconds.")
+	parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock responses that fail.")
+	parser.add_argument("--seed", type=int, default=1, help="Seed for the mock server's jitter and errors.")
+	parser.add_argument(
+		"--repeat",
+		type=int,
+		default=DEFAULT_REPEAT,
+		help="Runs of each benchmark; the median of each metric is reported.",
+	)
+	parser.add_argument("-o", "--output", help="Write the results to this file instead of stdout.")
+	parser.add_argument(
+		"--compare",
+		metavar="BASELINE",
+		help="Results file of an earlier run to compare with.",
+	)
+	parser.add_argument(
+		"--threshold",
+		type=float,
+		default=DEFAULT_THRESHOLD,
+		help="Relative slowdown between the current and baseline ranges reported as a regression.",
+	)
+	args = parser.parse_args(argv)
+	if args.repeat < 1:
+		parser.error("--repeat must be at least 1")
+
+	results = run(args)
+	text = json.dumps(results, indent="\t")
+	if args.output:
+		Path(args.output).write_text(text + "\n", encoding="utf-8")
+	else:
+		print(text)
+	if not args.compare:
+		return 0
+	baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+	regressions = compare(results, baseline, args.threshold)
+	for line in regressions:
+		print(f"Regression: {line}", file=sys.stderr)
+	return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
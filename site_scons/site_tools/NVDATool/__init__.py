@@ -4,9 +4,11 @@ This tool generates NVDA extensions.
 Builders:
 
 - NVDAAddon: Creates a .nvda-addon zip file. Requires the `excludePatterns` environment variable.
+  Unchanged files are reused from the previous bundle, tracked in a `.manifest.json` file next to it.
 - NVDAManifest: Creates the manifest.ini file.
 - NVDATranslatedManifest: Creates the manifest.ini file with only translated information.
 - md2html: Build HTML from Markdown
+- md2htmlBatch: Build HTML from many Markdown files at once, in parallel, skipping unchanged ones
 
 The following environment variables are required to create the manifest:
 
@@ -20,6 +22,13 @@ The following environment variables are required to build the HTML:
 - mdExtensions: list[str]
 - addon_info: .typings.AddonInfo
 
+md2htmlBatch takes the targets and sources in matching order and additionally uses:
+
+- moByLang: dict[str, str], the .mo file of each language directory
+- docsCache: str | None, file recording the inputs of the last build of each document
+
+Its targets are precious, so documents that are up to date survive until the action skips them.
+
 """
 
 from typing import Any
@@ -27,7 +36,7 @@ from SCons.Script import Environment, Builder
 
 from .addon import createAddonBundleFromPath
 from .manifests import generateManifest, generateTranslatedManifest
-from .docs import md2html
+from .docs import md2html, md2htmlBatch
 
 
 def generate(env: Environment):
@@ -129,6 +138,32 @@ def generate(env: Environment):
 		src_suffix=".md",
 	)
 
+	env.SetDefault(moByLang={})
+	env.SetDefault(docsCache=None)
+
+	def md_batch_action(target: list[Any], source: list[Any], env: Any):
+		return (
+			md2htmlBatch(
+				[(s.path, t.path, env["moByLang"].get(s.dir.name)) for t, s in zip(target, source)],
+				mdExtensions=env["mdExtensions"],
+				addon_info=env["addon_info"],
+				cacheFile=env["docsCache"],
+			)
+			and None
+		)
+
+	def md_batch_string(target: list[Any], source: list[Any], env: Any):
+		return f"Generating {len(target)} HTML documents"
+
+	def md_batch_emitter(target: list[Any], source: list[Any], env: Any):
+		# SCons deletes out-of-date targets before running their action, and as every
+		# document shares one action, any change would leave them all missing and rebuilt.
+		env.Precious(target)
+		return target, source
+
+	mdBatchAction = env.Action(md_batch_action, md_batch_string)
+	env["BUILDERS"]["md2htmlBatch"] = env.Builder(action=mdBatchAction, emitter=md_batch_emitter)
+
 
 def exists():
 	return True
@@ -1,6 +1,38 @@
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
 import zipfile
-from collections.abc import Iterable
-from pathlib import Path
+from collections.abc import Callable, Iterable
+from pathlib import Path, PurePath
+
+# Fixed timestamp for every member, so identical inputs give a byte-identical bundle.
+# SOURCE_DATE_EPOCH overrides it, as in other reproducible builds.
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Formats that are already compressed; deflating them again only costs time.
+STORED_SUFFIXES = frozenset(
+	(
+		".7z",
+		".bz2",
+		".gif",
+		".gz",
+		".jpeg",
+		".jpg",
+		".mp3",
+		".nvda-addon",
+		".ogg",
+		".png",
+		".webp",
+		".woff",
+		".woff2",
+		".xz",
+		".zip",
+	),
+)
 
 
 def matchesNoPatterns(path: Path, patterns: Iterable[str]) -> bool:
@@ -8,16 +40,158 @@ def matchesNoPatterns(path: Path, patterns: Iterable[str]) -> bool:
 	return not any((path.match(pattern) for pattern in patterns))
 
 
+def compileExcludePatterns(patterns: Iterable[str]) -> Callable[[tuple[str, ...]], bool]:
+	"""Compiles glob patterns once into a predicate over a path's parts, with the semantics of `PurePath.match`.
+
+	Each pattern is matched component by component against the end of the path,
+	or against the whole path when it is anchored.
+	"""
+	flags = re.IGNORECASE if os.name == "nt" else 0
+	compiled: list[tuple[bool, list[re.Pattern[str]]]] = []
+	lastParts: list[str] = []
+	for pattern in patterns:
+		pure = PurePath(pattern)
+		if not pure.parts:
+			continue
+		# An anchored pattern keeps its anchor as the first part, so it only matches paths with the same one.
+		regexes = [fnmatch.translate(part) for part in pure.parts]
+		lastParts.append(regexes[-1])
+		compiled.append((bool(pure.anchor), [re.compile(regex, flags) for regex in regexes]))
+	# Most paths match no pattern; a single test of the file name against all of them rules those out.
+	anyName = re.compile("|".join(lastParts), flags) if lastParts else None
+
+	def matches(pathParts: tuple[str, ...]) -> bool:
+		if anyName is None or not pathParts or not anyName.match(pathParts[-1]):
+			return False
+		for anchored, parts in compiled:
+			if len(parts) > len(pathParts) or (anchored and len(parts) != len(pathParts)):
+				continue
+			if all(regex.match(part) for regex, part in zip(parts, pathParts[-len(parts) :])):
+				return True
+		return False
+
+	return matches
+
+
+def _fileDigest(path: str) -> str:
+	h = hashlib.sha256()
+	with open(path, "rb") as f:
+		for chunk in iter(lambda: f.read(1024 * 1024), b""):
+			h.update(chunk)
+	return h.hexdigest()
+
+
+def _dateTime() -> tuple[int, int, int, int, int, int]:
+	epoch = os.environ.get("SOURCE_DATE_EPOCH")
+	if not epoch:
+		return DEFAULT_DATE_TIME
+	# Zip timestamps cannot go before 1980.
+	return max(DEFAULT_DATE_TIME, time.gmtime(int(epoch))[:6])
+
+
+def _memberInfo(
+	name: str,
+	dateTime: tuple[int, int, int, int, int, int],
+	compressType: int,
+) -> zipfile.ZipInfo:
+	info = zipfile.ZipInfo(name, date_time=dateTime)
+	info.compress_type = compressType
+	info.external_attr = 0o644 << 16
+	return info
+
+
+def _readRawMember(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+	"""Reads a member's data as stored in the archive, without decompressing it."""
+	fp = archive.fp
+	assert fp is not None
+	fp.seek(info.header_offset)
+	header = fp.read(zipfile.sizeFileHeader)
+	nameLength = int.from_bytes(header[26:28], "little")
+	extraLength = int.from_bytes(header[28:30], "little")
+	fp.seek(info.header_offset + zipfile.sizeFileHeader + nameLength + extraLength)
+	return fp.read(info.compress_size)
+
+
+def _writeRawMember(archive: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes):
+	"""Appends a member whose compressed data, CRC and sizes are already known."""
+	fp = archive.fp
+	assert fp is not None
+	info.header_offset = fp.tell()
+	fp.write(info.FileHeader(zip64=False))
+	fp.write(data)
+	archive.filelist.append(info)
+	archive.NameToInfo[info.filename] = info
+	archive.start_dir = fp.tell()
+
+
 def createAddonBundleFromPath(path: str | Path, dest: str, excludePatterns: Iterable[str]):
-	"""Creates a bundle from a directory that contains an addon manifest file."""
+	"""Creates a bundle from a directory that contains an addon manifest file.
+
+	Members are written in sorted order with a fixed timestamp, so the bundle only
+	changes when its contents do. A manifest of content hashes kept next to the
+	bundle lets unchanged files be copied from the previous bundle as they are,
+	without compressing them again.
+	"""
 	if isinstance(path, str):
 		path = Path(path)
 	basedir = path.absolute()
-	with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as z:
-		for p in basedir.rglob("*"):
-			if p.is_dir():
-				continue
-			pathInBundle = p.relative_to(basedir)
-			if matchesNoPatterns(pathInBundle, excludePatterns):
-				z.write(p, pathInBundle)
+	isExcluded = compileExcludePatterns(excludePatterns)
+	manifestPath = Path(f"{dest}.manifest.json")
+	try:
+		previous: dict[str, list] = json.loads(manifestPath.read_text(encoding="utf-8"))
+	except (OSError, ValueError):
+		previous = {}
+	try:
+		old = zipfile.ZipFile(dest) if previous else None
+	except (OSError, zipfile.BadZipFile):
+		old = None
+
+	files: list[tuple[str, str]] = []
+	for root, _dirs, names in os.walk(basedir):
+		dirParts = PurePath(os.path.relpath(root, basedir)).parts if root != str(basedir) else ()
+		for name in names:
+			pathParts = dirParts + (name,)
+			if not isExcluded(pathParts):
+				files.append(("/".join(pathParts), os.path.join(root, name)))
+	files.sort()
+
+	dateTime = _dateTime()
+	manifest: dict[str, list] = {}
+	tmpDest = f"{dest}.tmp"
+	try:
+		with zipfile.ZipFile(tmpDest, "w", zipfile.ZIP_DEFLATED) as z:
+			for name, p in files:
+				st = os.stat(p)
+				entry = previous.get(name)
+				# [size, mtime_ns, sha256]: the hash is only recomputed when size or mtime change.
+				if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+					digest = entry[2]
+				else:
+					digest = _fileDigest(p)
+				manifest[name] = [st.st_size, st.st_mtime_ns, digest]
+				compressType = (
+					zipfile.ZIP_STORED
+					if os.path.splitext(name)[1].lower() in STORED_SUFFIXES
+					else zipfile.ZIP_DEFLATED
+				)
+				info = _memberInfo(name, dateTime, compressType)
+				oldInfo = old.NameToInfo.get(name) if old and entry and entry[2] == digest else None
+				if (
+					oldInfo is not None
+					and oldInfo.compress_type == compressType
+					and oldInfo.file_size == st.st_size
+					and oldInfo.compress_size < zipfile.ZIP64_LIMIT
+				):
+					info.CRC = oldInfo.CRC
+					info.file_size = oldInfo.file_size
+					info.compress_size = oldInfo.compress_size
+					_writeRawMember(z, info, _readRawMember(old, oldInfo))
+				else:
+					with open(p, "rb") as src, z.open(info, "w") as dst:
+						shutil.copyfileobj(src, dst, 1024 * 1024)
+	finally:
+		if old:
+			old.close()
+	os.replace(tmpDest, dest)
+	manifestPath.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
 	return dest
@@ -1,47 +1,53 @@
 import gettext
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import markdown
 
 from .typings import AddonInfo
 
+# Bump when the generated HTML changes, so cached documents are rebuilt.
+CACHE_VERSION = 1
+
+# (source, dest, moFile)
+DocJob = tuple[str, str, str | None]
 
-def md2html(
-	source: str | Path,
-	dest: str | Path,
-	*,
-	moFile: str | Path | None,
-	mdExtensions: list[str],
-	addon_info: AddonInfo,
-):
-	if isinstance(source, str):
-		source = Path(source)
-	if isinstance(dest, str):
-		dest = Path(dest)
-	if isinstance(moFile, str):
-		moFile = Path(moFile)
 
+@lru_cache(maxsize=None)
+def _summary(moFile: str | None, summary: str) -> str:
+	"""The add-on summary translated with the given .mo file, read once per language."""
+	if not moFile:
+		return summary
 	try:
-		with moFile.open("rb") as f:
-			_ = gettext.GNUTranslations(f).gettext
+		with open(moFile, "rb") as f:
+			return gettext.GNUTranslations(f).gettext(summary)
 	except Exception:
-		summary = addon_info["addon_summary"]
-	else:
-		summary = _(addon_info["addon_summary"])
-	version = addon_info["addon_version"]
-	title = f"{summary} {version}"
-	lang = source.parent.name.replace("_", "-")
+		return summary
+
+
+@lru_cache(maxsize=None)
+def _markdown(extensions: tuple[str, ...]) -> markdown.Markdown:
+	"""One configured converter per extension set, reset between documents."""
+	return markdown.Markdown(extensions=list(extensions))
+
+
+def _render(mdText: str, *, title: str, lang: str, mdExtensions: Iterable[str]) -> str:
 	headerDic = {
 		'[[!meta title="': "# ",
 		'"]]': " #",
 	}
-	with source.open("r", encoding="utf-8") as f:
-		mdText = f.read()
 	for k, v in headerDic.items():
 		mdText = mdText.replace(k, v, 1)
-	htmlText = markdown.markdown(mdText, extensions=mdExtensions)
+	md = _markdown(tuple(mdExtensions))
+	htmlText = md.reset().convert(mdText)
 	# Optimization: build resulting HTML text in one go instead of writing parts separately.
-	docText = "\n".join(
+	return "\n".join(
 		(
 			"<!DOCTYPE html>",
 			f'<html lang="{lang}">',
@@ -55,5 +61,99 @@ def md2html(
 			"</body>\n</html>",
 		),
 	)
+
+
+def _title(moFile: str | Path | None, addon_info: AddonInfo) -> str:
+	summary = _summary(str(moFile) if moFile else None, addon_info["addon_summary"])
+	return f"{summary} {addon_info['addon_version']}"
+
+
+def md2html(
+	source: str | Path,
+	dest: str | Path,
+	*,
+	moFile: str | Path | None,
+	mdExtensions: list[str],
+	addon_info: AddonInfo,
+):
+	if isinstance(source, str):
+		source = Path(source)
+	if isinstance(dest, str):
+		dest = Path(dest)
+	lang = source.parent.name.replace("_", "-")
+	with source.open("r", encoding="utf-8") as f:
+		mdText = f.read()
+	docText = _render(mdText, title=_title(moFile, addon_info), lang=lang, mdExtensions=mdExtensions)
 	with dest.open("w", encoding="utf-8") as f:
 		f.write(docText)
+
+
+def _renderJob(job: DocJob, mdExtensions: list[str], addon_info: AddonInfo) -> str:
+	source, dest, moFile = job
+	md2html(source, dest, moFile=moFile, mdExtensions=mdExtensions, addon_info=addon_info)
+	return dest
+
+
+def _jobKey(job: DocJob, mdExtensions: list[str], addon_info: AddonInfo) -> str:
+	source, dest, moFile = job
+	h = hashlib.sha256()
+	h.update(json.dumps([CACHE_VERSION, dest, sorted(mdExtensions), addon_info["addon_summary"]]).encode())
+	h.update(addon_info["addon_version"].encode())
+	for path in (source, moFile):
+		if path and os.path.exists(path):
+			with open(path, "rb") as f:
+				h.update(f.read())
+		h.update(b"\0")
+	return h.hexdigest()
+
+
+def md2htmlBatch(
+	jobs: Iterable[DocJob],
+	*,
+	mdExtensions: list[str],
+	addon_info: AddonInfo,
+	cacheFile: str | Path | None = None,
+	maxWorkers: int | None = None,
+) -> list[str]:
+	"""Converts many Markdown documents, skipping those whose inputs are unchanged.
+
+	A document is rebuilt when the hash of its source, its language's .mo file and
+	the settings differs from the one recorded in cacheFile, or its output is
+	missing. The rest are rendered across a process pool, each worker loading a
+	language's translations and the Markdown converter only once.
+	Returns the documents that were rebuilt.
+	"""
+	cache: dict[str, str] = {}
+	if cacheFile:
+		try:
+			with open(cacheFile, "r", encoding="utf-8") as f:
+				cache = json.load(f)
+		except (OSError, ValueError):
+			cache = {}
+	keys: dict[str, str] = {}
+	todo: list[DocJob] = []
+	for job in jobs:
+		key = _jobKey(job, mdExtensions, addon_info)
+		keys[job[1]] = key
+		if cache.get(job[1]) != key or not os.path.exists(job[1]):
+			todo.append(job)
+
+	workers = min(len(todo), maxWorkers or os.cpu_count() or 1)
+	if workers > 1:
+		# Workers import this module by name, so its package has to be importable there too.
+		toolsDir = str(Path(__file__).resolve().parent.parent)
+		if toolsDir not in sys.path:
+			sys.path.append(toolsDir)
+		try:
+			with ProcessPoolExecutor(max_workers=workers) as pool:
+				built = list(pool.map(_renderJob, todo, [mdExtensions] * len(todo), [addon_info] * len(todo)))
+		except Exception as e:
+			print(f"Parallel documentation build failed ({e}), building serially")
+			built = [_renderJob(job, mdExtensions, addon_info) for job in todo]
+	else:
+		built = [_renderJob(job, mdExtensions, addon_info) for job in todo]
+
+	if cacheFile:
+		with open(cacheFile, "w", encoding="utf-8") as f:
+			json.dump(keys, f, indent="\t", sort_keys=True)
+	return built
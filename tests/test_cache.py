@@ -0,0 +1,155 @@
+"""Expiry, eviction and saving of the lookup cache.
+
+python -m unittest discover tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "addon" / "globalPlugins"))
+
+from accessibleKBBI.cache import LookupCache  # noqa: E402
+
+
+def _data(word: str, size: int = 0) -> dict[str, object]:
+	return {"lemma": word, "entries": [{"name": word, "padding": "x" * size}]}
+
+
+class CacheExpiryTest(unittest.TestCase):
+	# The patched clock, in seconds.
+	now = 0.0
+
+	def setUp(self):
+		self.now = 1000.0
+		patcher = mock.patch("accessibleKBBI.cache.time.time", side_effect=lambda: self.now)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_entry_expires_after_ttl(self):
+		cache = LookupCache(None, ttl=60)
+		cache.put("rumah", _data("rumah"))
+		self.now += 59
+		self.assertEqual(cache.get("rumah"), _data("rumah"))
+		self.now += 2
+		self.assertIsNone(cache.get("rumah"))
+		self.assertNotIn("rumah", cache)
+
+	def test_expired_entry_is_kept_for_stale_lookups(self):
+		cache = LookupCache(None, ttl=60)
+		cache.put("rumah", _data("rumah"))
+		self.now += 61
+		self.assertIsNone(cache.get("rumah"))
+		self.assertEqual(cache.lookup("rumah"), (_data("rumah"), False))
+
+	def test_each_lookup_is_counted_once(self):
+		cache = LookupCache(None, ttl=60)
+		cache.put("rumah", _data("rumah"))
+		cache.lookup("rumah")
+		self.now += 61
+		cache.lookup("rumah")
+		cache.lookup("makan")
+		self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+	def test_zero_ttl_never_expires(self):
+		cache = LookupCache(None, ttl=0)
+		cache.put("rumah", _data("rumah"))
+		self.now += 10**9
+		self.assertIsNotNone(cache.get("rumah"))
+
+	def test_put_restarts_ttl(self):
+		cache = LookupCache(None, ttl=60)
+		cache.put("rumah", _data("rumah"))
+		self.now += 50
+		cache.put("rumah", _data("rumah"))
+		self.now += 50
+		self.assertIsNotNone(cache.get("rumah"))
+
+
+class CacheEvictionTest(unittest.TestCase):
+	def test_least_recently_used_is_evicted(self):
+		cache = LookupCache(None, max_entries=2)
+		cache.put("a", _data("a"))
+		cache.put("b", _data("b"))
+		cache.get("a")
+		cache.put("c", _data("c"))
+		self.assertEqual(cache.keys(), ["a", "c"])
+
+	def test_evicts_to_stay_under_max_bytes(self):
+		cache = LookupCache(None, max_bytes=2500)
+		for word in ("a", "b", "c"):
+			cache.put(word, _data(word, size=1000))
+		self.assertEqual(cache.keys(), ["b", "c"])
+		self.assertLessEqual(cache.stats()["bytes"], 2500)
+
+	def test_keys_are_normalized(self):
+		cache = LookupCache(None)
+		cache.put(" Rumah ", _data("rumah"))
+		self.assertIn("rumah", cache)
+		self.assertEqual(len(cache), 1)
+
+
+class CacheSaveTest(unittest.TestCase):
+	path = ""
+
+	def setUp(self):
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.path = os.path.join(tmp.name, "cache.json")
+
+	def test_flush_and_load_keep_lru_order(self):
+		cache = LookupCache(self.path)
+		for word in ("a", "b", "c"):
+			cache.put(word, _data(word))
+		cache.get("a")
+		cache.flush()
+		loaded = LookupCache(self.path)
+		self.assertEqual(loaded.keys(), ["b", "c", "a"])
+		self.assertEqual(loaded.get("a"), _data("a"))
+
+	def test_load_applies_smaller_limits(self):
+		cache = LookupCache(self.path)
+		for word in ("a", "b", "c"):
+			cache.put(word, _data(word))
+		cache.flush()
+		self.assertEqual(LookupCache(self.path, max_entries=2).keys(), ["b", "c"])
+
+	def test_save_is_delayed_and_coalesced(self):
+		with mock.patch("accessibleKBBI.cache.SAVE_DELAY", 0.05):
+			cache = LookupCache(self.path)
+			cache.put("a", _data("a"))
+			cache.put("b", _data("b"))
+			self.assertFalse(os.path.exists(self.path))
+			time.sleep(0.3)
+		self.assertEqual(LookupCache(self.path).keys(), ["a", "b"])
+
+	def test_concurrent_puts_and_flushes_leave_a_valid_file(self):
+		cache = LookupCache(self.path)
+
+		def work(thread: int):
+			for i in range(50):
+				cache.put(f"kata{thread}-{i}", _data(f"kata{thread}-{i}"))
+				if i % 5 == 0:
+					cache.flush()
+
+		threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		cache.flush()
+		with open(self.path, encoding="utf-8") as f:
+			stored = json.load(f)
+		self.assertEqual(len(stored["entries"]), 200)
+		self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,241 @@
+"""Retries, the circuit breaker and stale answers, against the mock API in benchmarks.
+
+python -m unittest discover tests
+"""
+
+import http.client
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "addon" / "globalPlugins"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from accessibleKBBI.backends import HedgedRouter, HTTPBackend  # noqa: E402
+from accessibleKBBI.cache import LookupCache  # noqa: E402
+from accessibleKBBI.cli import main as cli_main  # noqa: E402
+from accessibleKBBI.client import KBBIClient  # noqa: E402
+from accessibleKBBI.config import ConfigManager  # noqa: E402
+from accessibleKBBI.connection import ConnectionPool  # noqa: E402
+from accessibleKBBI.lookup import OfflineUnavailableError, create_client, open_client  # noqa: E402
+from accessibleKBBI.offline import OfflineBackend, OfflineStore  # noqa: E402
+from accessibleKBBI.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy  # noqa: E402
+from mock_server import MockKBBIServer, load_fixtures  # noqa: E402
+
+FIXTURES = load_fixtures()
+
+
+class ResilienceTest(unittest.TestCase):
+	server: MockKBBIServer | None = None
+
+	def setUp(self):
+		self.server = MockKBBIServer(FIXTURES).start()
+		self.addCleanup(self.server.stop)
+
+	def client(
+		self,
+		attempts: int = 3,
+		breaker: CircuitBreaker | None = None,
+		cache: LookupCache | None = None,
+	) -> KBBIClient:
+		client = KBBIClient(
+			self.server.base_url,
+			cache=cache,
+			retry=RetryPolicy(attempts=attempts, base_delay=0.01, max_delay=0.02),
+			breaker=breaker,
+		)
+		self.addCleanup(client.backend.close)
+		return client
+
+	def test_retries_recover(self):
+		self.server.fail_next = 2
+		result = self.client(attempts=3).search("rumah")
+		self.assertEqual(result.lemma, "rumah")
+		self.assertEqual(self.server.requests, 3)
+
+	def test_retries_give_up(self):
+		self.server.fail_next = 3
+		with self.assertRaises(ConnectionError):
+			self.client(attempts=3).search("rumah")
+		self.assertEqual(self.server.requests, 3)
+
+	def test_not_found_is_not_retried(self):
+		with self.assertRaises(ValueError):
+			self.client(attempts=3).search("tidakada")
+		self.assertEqual(self.server.requests, 1)
+
+	def test_breaker_opens_and_closes_after_probe(self):
+		breaker = CircuitBreaker(threshold=2, cooldown=0.2)
+		client = self.client(attempts=1, breaker=breaker)
+		self.server.error_rate = 1.0
+		for _ in range(2):
+			with self.assertRaises(ConnectionError):
+				client.search("rumah")
+		self.assertTrue(breaker.is_open)
+
+		# While open, lookups fail without reaching the server.
+		with self.assertRaises(CircuitOpenError):
+			client.search("rumah")
+		self.assertEqual(self.server.requests, 2)
+
+		self.server.error_rate = 0.0
+		time.sleep(0.25)
+		self.assertEqual(client.search("rumah").lemma, "rumah")
+		self.assertFalse(breaker.is_open)
+		self.assertEqual(self.server.requests, 3)
+
+	def test_failed_probe_reopens_breaker(self):
+		breaker = CircuitBreaker(threshold=1, cooldown=0.2)
+		client = self.client(attempts=1, breaker=breaker)
+		self.server.error_rate = 1.0
+		with self.assertRaises(ConnectionError):
+			client.search("rumah")
+		time.sleep(0.25)
+		with self.assertRaises(ConnectionError):
+			client.search("rumah")
+		self.assertTrue(breaker.is_open)
+		with self.assertRaises(CircuitOpenError):
+			client.search("rumah")
+		self.assertEqual(self.server.requests, 2)
+
+	def test_stale_result_when_server_down(self):
+		cache = LookupCache(None, ttl=0.05)
+		client = self.client(attempts=2, cache=cache)
+		self.assertFalse(client.search("rumah").stale)
+		time.sleep(0.1)
+		self.server.stop()
+		result = client.search("rumah")
+		self.assertTrue(result.stale)
+		self.assertEqual(result.lemma, "rumah")
+
+	def test_stale_entry_is_revalidated_in_background(self):
+		cache = LookupCache(None, ttl=0.2)
+		breaker = CircuitBreaker(threshold=1, cooldown=0.1)
+		client = self.client(attempts=1, breaker=breaker, cache=cache)
+		client.search("rumah")
+		time.sleep(0.25)
+		self.server.error_rate = 1.0
+		with mock.patch("accessibleKBBI.client.REVALIDATE_INTERVAL", 0.15):
+			self.assertTrue(client.search("rumah").stale)
+			self.assertTrue(breaker.is_open)
+			self.server.error_rate = 0.0
+			deadline = time.monotonic() + 5
+			while self.server.requests < 3 and time.monotonic() < deadline:
+				time.sleep(0.02)
+		self.assertEqual(self.server.requests, 3)
+		self.assertFalse(breaker.is_open)
+		# The refreshed entry is served from the cache.
+		cache.ttl = 60
+		self.assertFalse(client.search("rumah").stale)
+		self.assertEqual(self.server.requests, 3)
+
+	def test_client_errors_do_not_open_breaker(self):
+		breaker = CircuitBreaker(threshold=1)
+		client = self.client(breaker=breaker)
+		with mock.patch.object(HTTPBackend, "_get", return_value=(400, b"")):
+			with self.assertRaises(ConnectionError):
+				client.search("rumah")
+		self.assertFalse(breaker.is_open)
+
+	def test_expired_entry_is_refreshed_when_server_up(self):
+		cache = LookupCache(None, ttl=0.05)
+		client = self.client(cache=cache)
+		client.search("rumah")
+		time.sleep(0.1)
+		self.assertFalse(client.search("rumah").stale)
+		self.assertEqual(self.server.requests, 2)
+
+	def test_no_stale_entry_raises(self):
+		client = self.client(attempts=1, cache=LookupCache(None))
+		self.server.error_rate = 1.0
+		with self.assertRaises(ConnectionError):
+			client.search("rumah")
+
+
+class ConnectionPoolTest(unittest.TestCase):
+	def test_failed_retry_closes_fresh_connection(self):
+		pool = ConnectionPool(timeout=1)
+		stale, fresh = mock.Mock(), mock.Mock()
+		pool._idle[("http", "example.invalid")] = [stale]
+		failures = [http.client.RemoteDisconnected(), TimeoutError()]
+		with (
+			mock.patch.object(ConnectionPool, "_new_connection", return_value=fresh),
+			mock.patch.object(ConnectionPool, "_request", side_effect=failures),
+		):
+			with self.assertRaises(TimeoutError):
+				pool.get("http://example.invalid/entry/rumah", {})
+		stale.close.assert_called_once_with()
+		fresh.close.assert_called_once_with()
+
+
+class OfflineFallbackTest(unittest.TestCase):
+	server: MockKBBIServer | None = None
+	router: HedgedRouter | None = None
+	client: KBBIClient | None = None
+
+	def setUp(self):
+		self.server = MockKBBIServer(FIXTURES).start()
+		self.addCleanup(self.server.stop)
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		# A partial dump: only one of the words the server knows.
+		dump_path = os.path.join(tmp.name, "dump.jsonl")
+		with open(dump_path, "wb") as f:
+			f.write(FIXTURES["rumah"] + b"\n")
+		store = OfflineStore(os.path.join(tmp.name, "offline.db"))
+		store.import_dump(dump_path)
+		http = HTTPBackend(self.server.base_url, retry=RetryPolicy(attempts=1))
+		self.router = HedgedRouter([http, OfflineBackend(store)], hedge_delay=5)
+		self.addCleanup(self.router.close)
+		self.client = KBBIClient(backend=self.router)
+
+	def test_store_answers_when_server_fails(self):
+		self.server.error_rate = 1.0
+		self.assertEqual(self.client.search("rumah").lemma, "rumah")
+		self.assertEqual(self.router.wins, {"offline": 1})
+
+	def test_word_missing_from_store_falls_through(self):
+		self.server.error_rate = 1.0
+		with self.assertRaises(ConnectionError):
+			self.client.search("makan")
+
+	def test_server_answers_first_when_up(self):
+		self.assertEqual(self.client.search("makan").lemma, "makan")
+		self.assertEqual(self.client.search("rumah").lemma, "rumah")
+		self.assertEqual(self.router.wins, {self.router.backends[0].name: 2})
+
+
+class OfflineModeTest(unittest.TestCase):
+	data_dir = ""
+
+	def setUp(self):
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.data_dir = tmp.name
+
+	def test_explicit_offline_without_store_raises(self):
+		with self.assertRaises(OfflineUnavailableError):
+			open_client(self.data_dir, offline=True)
+		self.assertFalse(os.path.exists(ConfigManager(self.data_dir).offline_db_path))
+
+	def test_cli_offline_without_store_exits_non_zero(self):
+		with mock.patch("sys.stderr"):
+			self.assertEqual(cli_main(["lookup", "--offline", "--data-dir", self.data_dir, "rumah"]), 1)
+
+	def test_configured_offline_mode_falls_back_with_a_warning(self):
+		config = ConfigManager(self.data_dir)
+		config.set_offline_mode(True)
+		self.addCleanup(config.flush)
+		with self.assertLogs(level="WARNING"):
+			client = create_client(config)
+		self.addCleanup(client.backend.close)
+		self.assertIsInstance(client.backend, HTTPBackend)
+
+
+if __name__ == "__main__":
+	unittest.main()